@@ -0,0 +1,45 @@
+import os
+import json
+import math
+import random
+
+def synthetic_map(count, seed=0):
+    """Map data with roughly count grid tiles: stacked runs of platforms with gaps and spikes
+
+    Rows alternate grass and stone so autotile sees both matching and mismatching
+    neighbours, and the spawner sits above the first platform so the player can run.
+    """
+    rng = random.Random(seed)
+    width = max(int(math.sqrt(count * 3)), 16)
+    tilemap = {}
+
+    index = 0
+    while len(tilemap) < count:
+        x, row = index % width, index // width
+        index += 1
+        y = row * 3 + 4
+        if rng.random() < 0.1:
+            continue
+
+        kind = 'grass' if row % 2 == 0 else 'stone'
+        tilemap[f'{x};{y}'] = {'type': kind, 'variant': 0, 'pos': [x, y]}
+        if x > 4 and rng.random() < 0.03:
+            tilemap[f'{x};{y - 1}'] = {'type': 'spikes', 'variant': 0, 'pos': [x, y - 1], 'rotation': 0}
+
+    for x in range(4):
+        tilemap[f'{x};4'] = {'type': 'stone', 'variant': 0, 'pos': [x, 4]}
+    tilemap['1;2'] = {'type': 'spawners', 'variant': 0, 'pos': [1, 2]}
+    tilemap[f'{width - 1};2'] = {'type': 'finish up', 'variant': 0, 'pos': [width - 1, 2]}
+    tilemap[f'{width - 1};3'] = {'type': 'finish down', 'variant': 0, 'pos': [width - 1, 3]}
+
+    return {
+        'tilemap': tilemap,
+        'offgrid': [],
+        'lowest_y': max(tile['pos'][1] for tile in tilemap.values()),
+    }
+
+def write_synthetic(directory, count, seed=0):
+    path = os.path.join(directory, f'synthetic-{count}.json')
+    with open(path, 'w') as f:
+        json.dump(synthetic_map(count, seed), f)
+    return path
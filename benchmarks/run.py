@@ -0,0 +1,148 @@
+import os
+import json
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+from time import perf_counter
+
+# The simulation never opens a window, a hidden display keeps pygame happy on servers
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from scripts.constants import TILE_SIZE
+from scripts.tilemap import Tilemap
+from scripts.simulation import Simulation
+from scripts.verifier import random_inputs
+from benchmarks.maps import write_synthetic
+
+REAL_MAPS = ['data/maps/0.json', 'data/maps/1.json']
+SYNTHETIC_SIZES = [10_000, 100_000, 1_000_000]
+BASELINE_PATH = 'benchmarks/baseline.json'
+
+def measure(fn, min_time=0.2, repeat=3):
+    """Best calls per second over a few repeats, each repeat runs for at least min_time"""
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls / elapsed)
+    return best
+
+def bench_tilemap(path, scratch, repeat):
+    tilemap = Tilemap(None, tile_size=TILE_SIZE)
+    results = {'load': measure(lambda: tilemap.load(path), repeat=repeat)}
+
+    save_path = os.path.join(scratch, 'save.json')
+    results['save'] = measure(lambda: tilemap.save(save_path), repeat=repeat)
+    results['autotile'] = measure(tilemap.autotile, repeat=repeat)
+    results['extract'] = measure(lambda: tilemap.extract([('spikes', 0), ('finish', 0)], keep=True), repeat=repeat)
+
+    # Query around real tiles, that is where the player spends its collision checks
+    rng = random.Random(0)
+    tiles = rng.sample(list(tilemap.tilemap.values()), min(1000, len(tilemap.tilemap)))
+    positions = [(tile['pos'][0] * TILE_SIZE + rng.random() * TILE_SIZE, tile['pos'][1] * TILE_SIZE - rng.random() * TILE_SIZE)
+                 for tile in tiles]
+
+    def queries():
+        for pos in positions:
+            tilemap.physics_rects_around(pos)
+    results['neighbour_queries'] = measure(queries, repeat=repeat) * len(positions)
+    return results, len(tilemap.tilemap)
+
+def bench_steps(path, frames, repeat):
+    sim = Simulation(path)
+    inputs = [{'left': bool(left), 'right': bool(right), 'jump': bool(jump)} for left, right, jump in random_inputs(frames)]
+
+    def run():
+        sim.reset()
+        for keys in inputs:
+            finished, dead = sim.step(keys)
+            if finished or dead:
+                sim.reset()
+    return measure(run, repeat=repeat) * len(inputs)
+
+def run_suite(map_paths, frames=2000, repeat=3):
+    results = {}
+    scratch = tempfile.mkdtemp(prefix='terboy-bench-')
+    try:
+        for path in map_paths:
+            name = os.path.basename(path)
+            print(f'{name} ...', flush=True)
+            timings, tiles = bench_tilemap(path, scratch, repeat)
+            timings['player_steps'] = bench_steps(path, frames, repeat)
+            for bench, rate in timings.items():
+                results[f'{name}/{bench}'] = {'ops_per_s': rate, 'tiles': tiles}
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+def compare(results, baseline, threshold):
+    """Rows of (name, baseline rate, current rate, ratio, regressed) for benchmarks in both runs"""
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['ops_per_s'], result['ops_per_s']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio < 1 - threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Tilemap and simulation throughput on real and synthetic maps')
+    parser.add_argument('--sizes', type=int, nargs='*', default=SYNTHETIC_SIZES, help='synthetic map sizes in tiles')
+    parser.add_argument('--quick', action='store_true', help='skip synthetic maps over 100k tiles and repeat once')
+    parser.add_argument('--frames', type=int, default=2000, help='simulation steps per player_steps repeat')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='results to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.15, help='slowdown that counts as a regression')
+    args = parser.parse_args()
+
+    sizes = [size for size in args.sizes if not args.quick or size <= 100_000]
+    repeat = 1 if args.quick else 3
+
+    synthetic_dir = tempfile.mkdtemp(prefix='terboy-maps-')
+    try:
+        map_paths = REAL_MAPS + [write_synthetic(synthetic_dir, size) for size in sizes]
+        results = run_suite(map_paths, args.frames, repeat)
+    finally:
+        shutil.rmtree(synthetic_dir, ignore_errors=True)
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system(), 'results': results}
+    for name, result in results.items():
+        print(f"{name:<38} {result['ops_per_s']:>14,.1f} /s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --save-baseline to create one')
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    rows = compare(results, baseline['results'], args.threshold)
+    print(f"\nAgainst {args.baseline} (python {baseline.get('python')}, {baseline.get('machine')}):")
+    for name, before, after, ratio, regressed in rows:
+        print(f"{name:<38} x{ratio:5.2f}{'  REGRESSION' if regressed else ''}")
+
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,46 +1,122 @@
+import time
+STARTED = time.perf_counter()
+
+import argparse
 import pygame
-from scripts.constants import DISPLAY_SIZE, FPS
+from scripts.constants import DISPLAY_SIZE, PROFILE_FRAMES, RENDER_SCALE
 from scripts.game import Game
 from scripts.menu import Menu
 from scripts.GameManager import game_state_manager
 from scripts.editor import EditorMenu
+from scripts.audio import init_audio, music
+from scripts.scheduler import FrameScheduler
+from scripts.profiler import profiler, capture
+from scripts.telemetry import telemetry
+from scripts.assets import asset_registry
 
 class Engine:
     def __init__(self):
         pygame.init()
+        init_audio()
 
         pygame.display.set_caption('Super Terboy')
         self.display = pygame.display.set_mode(DISPLAY_SIZE)
         self.clock = pygame.time.Clock()
-        self.game = Game(self.display, self.clock)
-        self.editor = EditorMenu(self.display)
-        self.menu = Menu(self.display)
+        self.scheduler = FrameScheduler(self.clock)
+
+        # States are built the first time they are entered, nothing is loaded for screens never visited
+        self.state_factories = {
+            'game': lambda: Game(self.display, self.clock),
+            'editor': lambda: EditorMenu(self.display),
+            'menu': lambda: Menu(self.display),
+        }
+        self.state = {}
+        self.startup_times = {'init': (time.perf_counter() - STARTED) * 1000}
+
+    def start_telemetry(self, path=None):
+        session = {'source': 'engine', 'display': DISPLAY_SIZE, 'render_scale': RENDER_SCALE}
+        if path:
+            telemetry.open(path, **session)
+        else:
+            telemetry.open_default(**session)
+        telemetry.add_source('assets', self.asset_stats)
+
+    def asset_stats(self):
+        disk = asset_registry.disk
+        return {
+            'hit_rate': round(asset_registry.hit_rate(), 4),
+            'cached': len(asset_registry.surfaces),
+            'disk_hits': disk.hits if disk else None,
+            'disk_misses': disk.misses if disk else None,
+        }
 
-        self.state = {'game': self.game, 'editor': self.editor, 'menu': self.menu}
+    def get_state(self, name):
+        if name not in self.state:
+            started = time.perf_counter()
+            self.state[name] = self.state_factories[name]()
+            self.startup_times[name] = (time.perf_counter() - started) * 1000
+        return self.state[name]
 
+    def report_startup(self):
+        total = (time.perf_counter() - STARTED) * 1000
+        parts = ', '.join(f'{name} {ms:.0f} ms' for name, ms in self.startup_times.items())
+        print(f'Startup: first frame after {total:.0f} ms ({parts})')
+
+    def profile_context(self, name, state):
+        context = {'state': name, 'display': DISPLAY_SIZE, 'fps': round(self.clock.get_fps(), 1)}
+        if hasattr(state, 'profile_context'):
+            context.update(state.profile_context())
+        return context
 
     def run(self):
         previous_state = None
-
-        dt = self.clock.tick(60) / 1000.0
+        first_frame = True
+        dt = self.scheduler.dt
 
         while True:
+            frame_started = time.perf_counter()
+            profiler.begin_frame()
             current_state = game_state_manager.getState()
             
+            state = self.get_state(current_state)
+            
             if previous_state == 'menu' and current_state == 'game':
-                self.game.initialize_environment()
+                state.initialize_environment()
             
             if current_state == 'game':
-                self.state[current_state].run(dt)
+                state.run(dt)
             else:
-                self.state[current_state].run()
+                state.run()
             
             previous_state = current_state
             
+            music.update()
             pygame.display.update()
-            self.clock.tick(FPS)
+            profiler.lap('flip')
+            profiler.end_frame()
+            if capture.running:
+                capture.end_frame(lambda: self.profile_context(current_state, state))
+            if first_frame:
+                self.report_startup()
+                first_frame = False
+            # Work time only, the pacing sleep and idle waits would hide how long frames really take
+            telemetry.frame(time.perf_counter() - frame_started)
+            dt = self.scheduler.end_frame(state)
 
 
 if __name__ == '__main__':
-    Engine().run()
+    parser = argparse.ArgumentParser(description='Super Terboy')
+    parser.add_argument('--profile', type=int, nargs='?', const=PROFILE_FRAMES, metavar='FRAMES',
+                        help='profile the first FRAMES frames with cProfile (F9 does the same in game)')
+    parser.add_argument('--tracemalloc', action='store_true', help='also record allocation growth during profiles')
+    parser.add_argument('--telemetry', metavar='PATH', help='append JSON-lines performance records to PATH ({pid} is filled in)')
+    args = parser.parse_args()
+
+    engine = Engine()
+    engine.start_telemetry(args.telemetry)
+    if args.tracemalloc:
+        capture.trace_memory_default = True
+    if args.profile:
+        capture.start(args.profile)
+    engine.run()
     
\ No newline at end of file
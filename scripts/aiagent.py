@@ -0,0 +1,148 @@
+import os
+import json
+import threading
+from scripts.constants import AI_FRAME_BUDGET_MS
+
+ACTION_KEYS = ('left', 'right', 'jump')
+GRID_OFFSETS = [(x, y) for y in (-1, 0, 1) for x in (-1, 0, 1)]
+FEATURE_SIZE = 8 + len(GRID_OFFSETS) * 3
+
+def _grid_index(rect, player_tile, tile_size):
+    dx = rect.x // tile_size - player_tile[0]
+    dy = rect.y // tile_size - player_tile[1]
+    if (dx, dy) in GRID_OFFSETS:
+        return GRID_OFFSETS.index((dx, dy))
+    return None
+
+def state_features(state, physics):
+    # Flatten Environment.get_state() into a fixed-size, resolution independent vector
+    tile_size = physics.tile_units
+    vel_x, vel_y = state['player_vel']
+    collisions = state['collisions']
+    features = [
+        vel_x / physics.max_x_speed,
+        vel_y / physics.max_y_speed,
+        float(state['player_grounded']),
+        min(state['player_air_time'], 10) / 10,
+        float(collisions['up']),
+        float(collisions['down']),
+        float(collisions['left']),
+        float(collisions['right']),
+    ]
+
+    player_tile = (state['player_pos'][0] // tile_size, state['player_pos'][1] // tile_size)
+    solid = [0.0] * len(GRID_OFFSETS)
+    hazard = [0.0] * len(GRID_OFFSETS)
+    finish = [0.0] * len(GRID_OFFSETS)
+
+    for rect in state['physics_tiles']:
+        index = _grid_index(rect, player_tile, tile_size)
+        if index is not None:
+            solid[index] = 1.0
+
+    for rect, (tile_type, _) in state['interactive_tiles']:
+        index = _grid_index(rect, player_tile, tile_size)
+        if index is None:
+            continue
+        if tile_type == 'finish':
+            finish[index] = 1.0
+        else:
+            hazard[index] = 1.0
+
+    return features + solid + hazard + finish
+
+class LinearPolicy:
+    def __init__(self, weights, bias=None, threshold=0.0):
+        self.weights = weights
+        self.bias = bias or {key: 0.0 for key in ACTION_KEYS}
+        self.threshold = threshold
+
+        for key in ACTION_KEYS:
+            if len(self.weights[key]) != FEATURE_SIZE:
+                raise ValueError(f"Policy weights for '{key}' expect {FEATURE_SIZE} features, got {len(self.weights[key])}")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('type', 'linear') != 'linear':
+            raise ValueError(f"Unsupported policy type: {data['type']}")
+        return cls(data['weights'], data.get('bias'), data.get('threshold', 0.0))
+
+    def act(self, features):
+        action = {}
+        for key in ACTION_KEYS:
+            score = self.bias.get(key, 0.0)
+            for weight, value in zip(self.weights[key], features):
+                score += weight * value
+            action[key] = score > self.threshold
+        return action
+
+class AIController:
+    def __init__(self, policy, physics, budget_ms=AI_FRAME_BUDGET_MS):
+        self.policy = policy
+        self.physics = physics
+        self.budget = budget_ms / 1000.0
+        self.last_action = {key: False for key in ACTION_KEYS}
+        self.late_frames = 0
+
+        self._condition = threading.Condition()
+        self._pending = None
+        self._request_id = 0
+        self._result_id = 0
+        self._consumed_id = 0
+        self._result = None
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name='ai-policy', daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_file(cls, path, physics):
+        if not os.path.exists(path):
+            return None
+        return cls(LinearPolicy.load(path), physics)
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                request_id, features = self._pending
+                self._pending = None
+
+            action = self.policy.act(features)
+
+            with self._condition:
+                self._result_id = request_id
+                self._result = action
+                self._condition.notify_all()
+
+    def act(self, state):
+        # Never block the frame for longer than the budget; if the policy runs late
+        # the previous action is repeated instead
+        features = state_features(state, self.physics)
+        with self._condition:
+            self._request_id += 1
+            request_id = self._request_id
+            self._pending = (request_id, features)
+            self._condition.notify_all()
+
+            if not self._condition.wait_for(lambda: self._result_id == request_id, timeout=self.budget):
+                self.late_frames += 1
+
+            # A late answer for an older frame is still fresher than the last action we used
+            if self._result_id > self._consumed_id:
+                self._consumed_id = self._result_id
+                self.last_action = self._result
+
+        return dict(self.last_action)
+
+    def reset(self):
+        self.last_action = {key: False for key in ACTION_KEYS}
+
+    def close(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
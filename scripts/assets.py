@@ -0,0 +1,285 @@
+import os
+import time
+import queue
+import struct
+import hashlib
+import threading
+import pygame
+from collections import OrderedDict
+from scripts.constants import (
+    ASSET_CACHE_SIZE, ASSET_DISK_CACHE, ASSET_CACHE_DIR, ASSET_STREAM_BUDGET_MS, DISPLAY_SIZE, TILE_SIZE
+)
+
+BASE_IMG_PATH = 'data/images/'
+BASE_SFX_PATH = 'data/sfx/'
+
+def has_transparency(surface):
+    # RGBA files are common even when every pixel is opaque, only real transparency needs alpha blits
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return False
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() < width * height
+
+def surface_format(colorkey, alpha):
+    """Pixel format an asset is converted to: alpha when the source has transparent pixels,
+    otherwise an RLE colorkey if the caller asked for one, otherwise opaque"""
+    if alpha:
+        return 'alpha'
+    return 'opaque' if colorkey is None else 'colorkey'
+
+def match_format(source, surface):
+    # Transforms keep the colorkey but drop RLE, put it back on the copy
+    colorkey = source.get_colorkey()
+    if colorkey is not None:
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    return surface
+
+def sound_files(path):
+    full_path = BASE_SFX_PATH + path
+    return [os.path.join(full_path, name) for name in sorted(os.listdir(full_path)) if name.endswith('.mp3')]
+
+def load_sounds(path, volume=0.05):
+    return sound_pool.get(path, volume)
+
+
+class DiskCache:
+    """Raw RGB(A) dumps of scaled sprites, one folder per display/tile size"""
+
+    HEADER = struct.Struct('<4sQII?') # magic, source mtime_ns, width, height, per-pixel alpha
+    MAGIC = b'SPM2'
+
+    def __init__(self, directory=ASSET_CACHE_DIR):
+        self.directory = os.path.join(directory, f'{DISPLAY_SIZE[0]}x{DISPLAY_SIZE[1]}-{TILE_SIZE}')
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, name + '.raw')
+
+    def load(self, key, source_path):
+        try:
+            with open(self._file(key), 'rb') as f:
+                magic, mtime, width, height, alpha = self.HEADER.unpack(f.read(self.HEADER.size))
+                # Stale when the source changed or the entry was written for another size
+                if magic != self.MAGIC or mtime != os.stat(source_path).st_mtime_ns or (width, height) != key[1]:
+                    self.misses += 1
+                    return None
+                pixels = f.read()
+        except (OSError, struct.error):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return pygame.image.frombytes(pixels, (width, height), 'RGBA' if alpha else 'RGB'), alpha
+
+    def save(self, key, source_path, surface, alpha):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._file(key)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, os.stat(source_path).st_mtime_ns, *surface.get_size(), alpha))
+                f.write(pygame.image.tobytes(surface, 'RGBA' if alpha else 'RGB'))
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+class AssetRegistry:
+    """Process-wide image cache so every (path, scale, colorkey) is decoded and scaled once"""
+
+    def __init__(self, capacity=ASSET_CACHE_SIZE, disk_cache=ASSET_DISK_CACHE):
+        self.capacity = capacity
+        self.disk = DiskCache() if disk_cache else None
+        self.surfaces = OrderedDict()
+        self.listings = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path, scale=None, colorkey=(0, 0, 0)):
+        return (path, tuple(scale) if scale is not None else None, tuple(colorkey) if colorkey is not None else None)
+
+    def keys(self, path, scale=None, colorkey=(0, 0, 0)):
+        return [self.key(path + '/' + name, scale, colorkey) for name in self.listdir(path)]
+
+    def image(self, path, scale=None, colorkey=(0, 0, 0)):
+        key = self.key(path, scale, colorkey)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        return self.adopt(key, self.decode(key))
+
+    def decode(self, key):
+        """Returns (surface, alpha), safe to call off the main thread since nothing here touches the display"""
+        path, scale, _ = key
+        source_path = BASE_IMG_PATH + path
+
+        # Only scaled sprites are worth caching on disk, plain decodes are as fast as reading a dump
+        if self.disk and scale is not None:
+            decoded = self.disk.load(key, source_path)
+            if decoded is not None:
+                return decoded
+
+        surface = pygame.image.load(source_path)
+        if scale is not None:
+            surface = pygame.transform.scale(surface, scale)
+        alpha = has_transparency(surface)
+        if self.disk and scale is not None:
+            self.disk.save(key, source_path, surface, alpha)
+        return surface, alpha
+
+    def adopt(self, key, decoded):
+        # Conversion to the display format has to happen on the main thread
+        surface, alpha = decoded
+        mode = surface_format(key[2], alpha)
+        if mode == 'alpha':
+            surface = surface.convert_alpha()
+        else:
+            surface = surface.convert()
+            if mode == 'colorkey':
+                # RLE skips transparent runs when blitting, sprites are never drawn onto so it stays valid
+                surface.set_colorkey(key[2], pygame.RLEACCEL)
+
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def images(self, path, scale=None, colorkey=(0, 0, 0)):
+        return [self.image(path + '/' + name, scale, colorkey) for name in self.listdir(path)]
+
+    def listdir(self, path):
+        if path not in self.listings:
+            self.listings[path] = sorted(os.listdir(BASE_IMG_PATH + path))
+        return self.listings[path]
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.listings.clear()
+
+asset_registry = AssetRegistry()
+
+class SpriteVariants:
+    """Flipped and rotated copies built when sprites load, so nothing is transformed per frame
+
+    Lookups are plain list indexing: variant, then quarter turns or a facing-left flag.
+    """
+
+    def __init__(self):
+        self.rotations = {}
+        self.mirrors = {}
+
+    def add_rotations(self, tile_type, images):
+        self.rotations[tile_type] = [
+            [match_format(img, pygame.transform.rotate(img, 90 * turns)) for turns in range(4)] for img in images
+        ]
+
+    def rotated(self, tile_type, variant, rotation):
+        return self.rotations[tile_type][variant][rotation // 90 % 4]
+
+    def add_mirrors(self, name, images):
+        self.mirrors[name] = (images, [match_format(img, pygame.transform.flip(img, True, False)) for img in images])
+
+    def facing(self, name, facing_left):
+        return self.mirrors[name][facing_left]
+
+class SoundPool:
+    """Short effects decoded once per (folder, volume) and shared by every state"""
+
+    def __init__(self):
+        self.groups = {}
+        self.lock = threading.Lock()
+
+    def get(self, path, volume=0.05):
+        key = (path, volume)
+        with self.lock:
+            sounds = self.groups.get(key)
+        if sounds is not None:
+            return sounds
+
+        # Decoding happens outside the lock so a stream worker never stalls the main thread
+        sounds = []
+        for file in sound_files(path):
+            sound = pygame.mixer.Sound(file)
+            sound.set_volume(volume)
+            sounds.append(sound)
+
+        with self.lock:
+            return self.groups.setdefault(key, sounds)
+
+    def clear(self):
+        with self.lock:
+            self.groups.clear()
+
+sound_pool = SoundPool()
+
+class AssetStream:
+    """Decodes images and sounds on a worker thread while the main thread keeps drawing
+
+    Images are decoded first so a state can start as soon as images_ready is set; sounds
+    are written into sound_target as they arrive. pump() must be called from the main
+    thread, it converts whatever the worker has finished and registers it.
+    """
+
+    def __init__(self, images=(), sounds=None, sound_target=None, registry=asset_registry):
+        self.registry = registry
+        self.image_keys = [key for key in dict.fromkeys(images) if key not in registry.surfaces]
+        self.sound_jobs = list((sounds or {}).items()) # name -> (folder, volume)
+        self.sound_target = sound_target if sound_target is not None else {}
+        self.total = len(self.image_keys) + len(self.sound_jobs)
+        self.loaded = 0
+        self.images_loaded = 0
+
+        self._decoded = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name='asset-stream', daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        try:
+            for key in self.image_keys:
+                self._decoded.put(('image', key, self.registry.decode(key)))
+            for name, (folder, volume) in self.sound_jobs:
+                self._decoded.put(('sound', name, load_sounds(folder, volume)))
+        except Exception as error:
+            self._decoded.put(('error', None, error))
+
+    @property
+    def images_ready(self):
+        return self.images_loaded == len(self.image_keys)
+
+    @property
+    def done(self):
+        return self.loaded == self.total
+
+    @property
+    def progress(self):
+        return self.loaded / self.total if self.total else 1.0
+
+    def pump(self, budget_ms=ASSET_STREAM_BUDGET_MS):
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while not self.done:
+            try:
+                kind, key, value = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'error':
+                raise value
+            if kind == 'image':
+                self.registry.adopt(key, value)
+                self.images_loaded += 1
+            else:
+                self.sound_target[key] = value
+            self.loaded += 1
+
+            if time.perf_counter() >= deadline:
+                break
+        return self.done
@@ -0,0 +1,75 @@
+import os
+import pygame
+from scripts.constants import SFX_CHANNELS, MUSIC_VOLUME, MUSIC_FADE_MS, MUSIC_TRACKS
+
+EVENT_SOUNDS = {'jumped': 'jump', 'wall_hit': 'collide', 'died': 'death', 'finished': 'finish'}
+
+def init_audio(channels=SFX_CHANNELS):
+    # Sound.play() returns None when every channel is busy, which caps overlapping effects
+    if pygame.mixer.get_init():
+        pygame.mixer.set_num_channels(channels)
+
+class MusicPlayer:
+    """Streams background tracks with pygame.mixer.music instead of decoding them into a Sound
+
+    The music stream has a single voice, so a switch fades the old track out and the new
+    one in once it has stopped. Call update() every frame to start the queued track.
+    """
+
+    def __init__(self, tracks=MUSIC_TRACKS, volume=MUSIC_VOLUME, fade_ms=MUSIC_FADE_MS):
+        self.tracks = tracks
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.current = None
+        self.pending = None
+        self.switching = False
+
+    def play(self, name):
+        path = self.tracks.get(name)
+        if path is not None and not os.path.exists(path):
+            path = None
+        if path == (self.pending if self.switching else self.current) or not pygame.mixer.get_init():
+            return
+
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(self.fade_ms)
+            self.pending = path
+            self.switching = True
+        else:
+            self._start(path)
+
+    def update(self):
+        if self.switching and not pygame.mixer.music.get_busy():
+            self._start(self.pending)
+
+    def _start(self, path):
+        self.pending = None
+        self.switching = False
+        self.current = path
+        if path is None:
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=-1, fade_ms=self.fade_ms)
+
+    def stop(self):
+        self.pending = None
+        self.switching = False
+        self.current = None
+        if pygame.mixer.get_init():
+            pygame.mixer.music.fadeout(self.fade_ms)
+
+music = MusicPlayer()
+
+class AudioConsumer:
+    """Turns a frame's gameplay events into sound effects, only built where a display exists"""
+
+    def __init__(self, sfx, rng):
+        self.sfx = sfx
+        self.rng = rng
+
+    def consume(self, events):
+        for name in events:
+            sounds = self.sfx.get(EVENT_SOUNDS.get(name))
+            if sounds:
+                self.rng.choice(sounds).play()
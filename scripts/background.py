@@ -0,0 +1,69 @@
+import os
+import pygame
+from scripts.constants import BACKGROUND_THEMES, MAP_BACKGROUNDS
+from scripts.assets import asset_registry
+
+def map_theme(map_path):
+    """Theme for a map file, maps without an entry cycle through the themes by index"""
+    try:
+        index = int(os.path.basename(map_path).split('.')[0])
+    except (TypeError, ValueError):
+        index = 0
+    if index in MAP_BACKGROUNDS:
+        return MAP_BACKGROUNDS[index]
+    themes = sorted(BACKGROUND_THEMES)
+    return themes[index % len(themes)]
+
+def theme_keys(theme, size):
+    return [asset_registry.key(path, size, None) for path, _ in BACKGROUND_THEMES[theme]]
+
+class ParallaxLayer:
+    """One background image baked into a strip of itself and its mirror image
+
+    The mirrored copy hides the seam wherever the image wraps, and because the strip
+    is at least as wide as the view, any scroll position is covered by two blits.
+    """
+
+    def __init__(self, image, depth, view_width):
+        tile_w, height = image.get_size()
+        copies = [image, pygame.transform.flip(image, True, False)]
+        tiles = 2
+        while tiles * tile_w < view_width:
+            tiles += 2
+
+        self.strip = pygame.Surface((tiles * tile_w, height)).convert()
+        self.strip.blits([(copies[i % 2], (i * tile_w, 0)) for i in range(tiles)], doreturn=False)
+        self.depth = depth
+
+    def render(self, surf, offset_x):
+        period, height = self.strip.get_size()
+        view_w = surf.get_width()
+        x = int(offset_x * self.depth) % period
+
+        first = min(period - x, view_w)
+        surf.blit(self.strip, (0, 0), (x, 0, first, height))
+        if first < view_w:
+            surf.blit(self.strip, (first, 0), (0, 0, view_w - first, height))
+
+class ParallaxBackground:
+    """Horizontal parallax layers for one theme, farthest first
+
+    Strips are kept per (path, size) so switching back to a theme costs nothing.
+    """
+
+    strips = {}
+
+    def __init__(self, theme, size):
+        self.theme = theme
+        self.layers = []
+        for path, depth in BACKGROUND_THEMES[theme]:
+            key = (path, size, depth)
+            layer = self.strips.get(key)
+            if layer is None:
+                layer = ParallaxLayer(asset_registry.image(path, size, None), depth, size[0])
+                self.strips[key] = layer
+            self.layers.append(layer)
+
+    def render(self, surf, offset=(0, 0)):
+        for layer in self.layers:
+            layer.render(surf, offset[0])
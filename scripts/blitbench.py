@@ -0,0 +1,87 @@
+import os
+import json
+import time
+import argparse
+
+# Converting needs a display, a hidden one is enough when run from a terminal
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from scripts.constants import DISPLAY_SIZE, TILE_SIZE, PLAYERS_IMAGE_SIZE
+from scripts.assets import BASE_IMG_PATH, asset_registry
+
+SPRITE_SETS = {
+    'tiles': [(f'tiles/{folder}', (TILE_SIZE, TILE_SIZE)) for folder in ('grass', 'stone', 'pinkrock', 'spikes', 'kill')],
+    'player': [(f'player/{folder}', PLAYERS_IMAGE_SIZE) for folder in ('idle', 'run', 'jump_rising', 'wallslide')],
+}
+
+def prepare(surface, mode):
+    """Turn a freshly scaled sprite into one of the formats the loader can pick"""
+    if mode == 'unconverted':
+        surface = surface.copy()
+        surface.set_colorkey((0, 0, 0))
+        return surface
+    if mode == 'alpha':
+        return surface.convert_alpha()
+
+    surface = surface.convert()
+    if mode == 'colorkey':
+        surface.set_colorkey((0, 0, 0))
+    elif mode == 'colorkey_rle':
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+    return surface
+
+MODES = ('unconverted', 'opaque', 'colorkey', 'colorkey_rle', 'alpha')
+
+def load_sprites(name):
+    sprites = []
+    for folder, scale in SPRITE_SETS[name]:
+        for file in asset_registry.listdir(folder):
+            sprites.append(pygame.transform.scale(pygame.image.load(BASE_IMG_PATH + folder + '/' + file), scale))
+    return sprites
+
+def bench(sprites, target, seconds):
+    # Lay the sprites out on a grid covering the target, like a screen full of tiles
+    width, height = target.get_size()
+    step = sprites[0].get_width()
+    positions = [(x, y) for y in range(0, height, step) for x in range(0, width, step)]
+    batch = [(sprites[i % len(sprites)], pos) for i, pos in enumerate(positions)]
+
+    target.blits(batch, doreturn=False) # the first blit of an RLE surface does the encoding
+    blits = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        target.blits(batch, doreturn=False)
+        blits += len(batch)
+    return blits / (time.perf_counter() - start)
+
+def run(seconds=0.5):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    target = pygame.Surface(DISPLAY_SIZE).convert()
+
+    results = {}
+    for name in SPRITE_SETS:
+        raw = load_sprites(name)
+        results[name] = {mode: bench([prepare(img, mode) for img in raw], target, seconds) for mode in MODES}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Blit throughput of each pixel format on the real tile and player sprites')
+    parser.add_argument('--seconds', type=float, default=0.5, help='time spent on each sprite set and format')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    results = run(args.seconds)
+    for name, modes in results.items():
+        baseline = modes['unconverted']
+        print(f'{name} ({DISPLAY_SIZE[0]}x{DISPLAY_SIZE[1]} target)')
+        for mode, rate in modes.items():
+            print(f'  {mode:<13} {rate / 1000:9.1f}k blits/s  x{rate / baseline:.2f}')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'display': DISPLAY_SIZE, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
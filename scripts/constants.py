@@ -1,27 +1,60 @@
-import tkinter as tk
-root = tk.Tk()
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-root.destroy()
-DISPLAY_SIZE = (screen_width, screen_height)
+import os
+import pygame
+
+def _screen_size():
+    # TERBOY_DISPLAY_SIZE=1280x720 skips the desktop query, handy for windowed and headless runs
+    override = os.environ.get('TERBOY_DISPLAY_SIZE')
+    if override:
+        width, height = override.lower().split('x')
+        return int(width), int(height)
+    try:
+        pygame.display.init()
+        return pygame.display.get_desktop_sizes()[0]
+    except (pygame.error, IndexError):
+        return 1920, 1080
+
+DISPLAY_SIZE = _screen_size()
 if DISPLAY_SIZE[0] / 16 != 0 or DISPLAY_SIZE[1] / 9 != 0:
     DISPLAY_SIZE = (DISPLAY_SIZE[0] - DISPLAY_SIZE[0] % 16, DISPLAY_SIZE[1] - DISPLAY_SIZE[1] % 9)
 
 FPS = 60
+IDLE_FPS = 10 # frame rate for menus and the editor once nothing has changed for a while
+IDLE_AFTER_FRAMES = 30
 BASE_IMG_DUR = 20
 TILE_SIZE = DISPLAY_SIZE[0] // 28 # tilemap tile size
 
-PLAYER_SPEED = 0.8   *TILE_SIZE/36 # added per frame
-JUMP_SPEED = 14  *TILE_SIZE/36 # initial jump velocity
-WALLSLIDE_SPEED = 0.7  *TILE_SIZE/36 # the speed in which the player will slide off a wall
-WALLJUMP_X_SPEED = 9  *TILE_SIZE/36 # the x velocity of the player when jumpingoff of a wall
-WALLJUMP_Y_SPEED = 15  *TILE_SIZE/36 # the y velocity of the player when jumpingoff of a wall
-GRAVITY_UP = 0.6   *TILE_SIZE/36 # subtracted from y velocity every frame when player going up
-GRAVITY_DOWN = 0.3  *TILE_SIZE/36 # subtracted from y velocity every frame when player going down
-ACCELERAION = 0.001  *TILE_SIZE/36 # friction with the ground on the x axis when starting to move, between 0 and 1 (0 < Acc < 1)
-DECCELARATION = 0.1   *TILE_SIZE/36 # friction with the ground on the x axis when stopping to move, between 0 and 1 (0 < Acc < 1)
-MAX_X_SPEED = 10   *TILE_SIZE/36 # x axis speed limit
-MAX_Y_SPEED = 18   *TILE_SIZE/36 # y axis speed limit
+PHYSICS_REFERENCE_TILE = 36 # tile size in pixels the physics values below were tuned at
+
+# physics values in pixels per frame at the reference tile size
+BASE_PHYSICS = {
+    'player_speed': 0.8, # added per frame
+    'jump_speed': 14, # initial jump velocity
+    'wallslide_speed': 0.7, # the speed in which the player will slide off a wall
+    'walljump_x_speed': 9, # the x velocity of the player when jumpingoff of a wall
+    'walljump_y_speed': 15, # the y velocity of the player when jumpingoff of a wall
+    'gravity_up': 0.6, # subtracted from y velocity every frame when player going up
+    'gravity_down': 0.3, # subtracted from y velocity every frame when player going down
+    'acceleration': 0.001, # friction with the ground on the x axis when starting to move, between 0 and 1 (0 < Acc < 1)
+    'decceleration': 0.1, # friction with the ground on the x axis when stopping to move, between 0 and 1 (0 < Acc < 1)
+    'max_x_speed': 10, # x axis speed limit
+    'max_y_speed': 18, # y axis speed limit
+}
+
+PLAYER_SPEED = BASE_PHYSICS['player_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+JUMP_SPEED = BASE_PHYSICS['jump_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+WALLSLIDE_SPEED = BASE_PHYSICS['wallslide_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+WALLJUMP_X_SPEED = BASE_PHYSICS['walljump_x_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+WALLJUMP_Y_SPEED = BASE_PHYSICS['walljump_y_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+GRAVITY_UP = BASE_PHYSICS['gravity_up'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+GRAVITY_DOWN = BASE_PHYSICS['gravity_down'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+ACCELERAION = BASE_PHYSICS['acceleration'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+DECCELARATION = BASE_PHYSICS['decceleration'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+MAX_X_SPEED = BASE_PHYSICS['max_x_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+MAX_Y_SPEED = BASE_PHYSICS['max_y_speed'] *TILE_SIZE/PHYSICS_REFERENCE_TILE
+
+FIXED_POINT_PHYSICS = False # simulate in tile-relative integers, identical on every screen size
+SUBPIXELS = 256 # fixed point units per reference pixel
+TILE_UNITS = PHYSICS_REFERENCE_TILE * SUBPIXELS # fixed point units per tile
 
 WALL_MOMENTUM_PRESERVE = 0.15  # Percentage of upward velocity preserved when hitting wall
 WALL_MOMENTUM_FRAMES = 3 # amount of frames activated
@@ -32,6 +65,51 @@ COYOTE_TIME = 6 # amount of frames you can jump after leaving the ground
 PLAYERS_SIZE = (TILE_SIZE, TILE_SIZE) # size of actual player hitbox
 PLAYERS_IMAGE_SIZE = (PLAYERS_SIZE[0], PLAYERS_SIZE[1]) # size of the player image
 
+AI_POLICY_PATH = 'data/policies/policy.json' # trained policy used when player type is AI
+AI_FRAME_BUDGET_MS = 2 # max time a frame waits for the policy before repeating the last action
+
+RECORD_DEMOS = False # record human play for imitation learning
+DEMO_DIR = 'data/demos' # where recorded demonstrations are written
+DEMO_CHUNK_FRAMES = 4096 # rows per .npy shard
+
+CURRICULUM_WINDOW = 50 # recent attempts per map used for its success rate
+CURRICULUM_ADVANCE_RATE = 0.7 # success rate on the newest map needed to unlock the next one
+CURRICULUM_MIN_ATTEMPTS = 20 # attempts on the newest map before it can unlock the next one
+
+VERIFY_EVERY = 60 # frames between state hashes when checking runs for determinism
+
+ASSET_CACHE_SIZE = 1024 # decoded and scaled surfaces kept by the asset registry
+ASSET_DISK_CACHE = True # keep pre-scaled sprites on disk so warm starts skip decoding and scaling
+ASSET_CACHE_DIR = '.cache/assets'
+ASSET_STREAM_BUDGET_MS = 8 # main thread time per frame spent converting streamed assets
+RENDER_SCALE = 1.0 # world resolution relative to the window, 0.5 draws a quarter of the pixels and upscales
+HUD_NATIVE = True # draw the timer and debug text after upscaling so they stay sharp
+BACKGROUND_THEMES = { # (image, depth) layers farthest first, depth is the share of camera movement a layer follows
+    'night': [('background/night.png', 0.05)],
+    'space': [('background/space.png', 0.05)],
+    'cave': [('background/cave.png', 0.1)],
+    'nether': [('background/nether.png', 0.1)],
+    'stronghold': [('background/stronghold.png', 0.15)],
+}
+MAP_BACKGROUNDS = {0: 'night', 1: 'space'} # map index -> theme, other maps cycle through the themes
+PROFILER_WINDOW = 300 # frames kept per phase for the F3 profiler percentiles and graph
+PROFILER_REFRESH = 15 # frames between percentile table updates
+PROFILE_FRAMES = 300 # frames captured with cProfile when F9 is pressed
+PROFILE_TRACEMALLOC = False # also diff tracemalloc snapshots around each capture
+PROFILE_DIR = 'data/profiles'
+TELEMETRY_PATH = os.environ.get('TERBOY_TELEMETRY') # JSON-lines perf log, {pid} is filled in, unset disables it
+TELEMETRY_INTERVAL = 10 # seconds between telemetry records
+TELEMETRY_WINDOW = 3600 # frame times kept per record for its percentiles
+STAR_COUNT = 25 # the starfield draws in one batch, thousands are fine
+STAR_MIN_DIST = 200 # shrunk automatically when STAR_COUNT would not fit
+SFX_CHANNELS = 12 # mixer channels shared by every sound effect, extra plays are dropped
+MUSIC_VOLUME = 0.3
+MUSIC_FADE_MS = 800
+MUSIC_TRACKS = { # streamed from disk, point a state at another file to crossfade on switch
+    'menu': 'data/sfx/music/music.mp3',
+    'game': 'data/sfx/music/music.mp3',
+}
+
 PHYSICS_TILES = {'grass', 'stone', 'pinkrock'}
 AUTOTILE_TYPES = {'grass', 'stone', 'kill', 'pinkrock'}
 INTERACTIVE_TILES = {'finish', 'spikes', 'kill', 'portal up', 'portal down'}
@@ -42,7 +120,7 @@ FONT = r'data\fonts\Menu.ttf'
 
 EDITOR_SCROLL_SPEED = 12 # how fast you can move in the editor using WASD
 
-MENUBG = r'data\images\menugbg.png'
+MENUBG = 'menugbg.png' # relative to data/images, loaded through the asset registry
 
 MENUTXTCOLOR = (120, 83, 58)
 WHITE = (255, 255, 255)
@@ -0,0 +1,104 @@
+import os
+import random
+from collections import deque
+from scripts.constants import CURRICULUM_WINDOW, CURRICULUM_ADVANCE_RATE, CURRICULUM_MIN_ATTEMPTS
+from scripts.tilemap import map_cache
+from scripts.physics import create_physics
+
+def list_maps(maps_dir='data/maps'):
+    maps = [f for f in os.listdir(maps_dir) if f.endswith('.json') and f.split('.')[0].isdigit()]
+    maps.sort(key=lambda f: int(f.split('.')[0]))
+    return [os.path.join(maps_dir, f) for f in maps]
+
+class MapStats:
+    def __init__(self, window=CURRICULUM_WINDOW):
+        self.attempts = 0
+        self.successes = 0
+        self.total_frames = 0
+        self.recent = deque(maxlen=window)
+
+    def record(self, success, frames):
+        self.attempts += 1
+        self.recent.append(success)
+        if success:
+            self.successes += 1
+            self.total_frames += frames
+
+    @property
+    def success_rate(self):
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    @property
+    def mean_frames(self):
+        return self.total_frames / self.successes if self.successes else None
+
+class Curriculum:
+    """Adaptive map sampler for training runs
+
+    Maps unlock in data/maps order: the next one opens once the newest unlocked map
+    is cleared often enough. Unlocked maps are sampled with the most weight on those
+    the agent solves about half the time, where there is the most left to learn.
+    """
+
+    def __init__(self, map_paths=None, seed=None, physics_size=None,
+                 advance_rate=CURRICULUM_ADVANCE_RATE, min_attempts=CURRICULUM_MIN_ATTEMPTS):
+        self.map_paths = map_paths or list_maps()
+        self.stats = {path: MapStats() for path in self.map_paths}
+        self.rng = random.Random(seed)
+        self.physics_size = physics_size or create_physics().tile_units
+        self.advance_rate = advance_rate
+        self.min_attempts = min_attempts
+        self.unlocked = 1
+
+    def record(self, map_path, success, frames):
+        self.stats[map_path].record(success, frames)
+
+        frontier = self.stats[self.map_paths[self.unlocked - 1]]
+        if (self.unlocked < len(self.map_paths) and frontier.attempts >= self.min_attempts
+                and frontier.success_rate >= self.advance_rate):
+            self.unlocked += 1
+
+    def active_maps(self):
+        return self.map_paths[:self.unlocked]
+
+    def upcoming_maps(self):
+        # Everything a worker may be asked to reset into next, including the map that unlocks next
+        return self.map_paths[:self.unlocked + 1]
+
+    def weight(self, map_path):
+        stats = self.stats[map_path]
+        if not stats.recent:
+            return 1.0
+        rate = stats.success_rate
+        return max(0.05, 4 * rate * (1 - rate))
+
+    def sample(self):
+        maps = self.active_maps()
+        return self.rng.choices(maps, weights=[self.weight(path) for path in maps])[0]
+
+    def assign(self, num_envs):
+        return [self.sample() for _ in range(num_envs)]
+
+    def preload(self):
+        map_cache.preload(self.upcoming_maps(), self.physics_size)
+
+    def summary(self):
+        return {
+            path: {
+                'attempts': stats.attempts,
+                'success_rate': stats.success_rate,
+                'mean_frames': stats.mean_frames,
+                'weight': self.weight(path) if path in self.active_maps() else 0.0,
+            }
+            for path, stats in self.stats.items()
+        }
+
+def init_worker(map_paths, physics_size=None):
+    # Pool initializer: compile every map the curriculum can hand out before the first reset
+    map_cache.preload(map_paths, physics_size or create_physics().tile_units)
+
+def reset_into(simulation, map_path, preload_paths=()):
+    # Warm the maps the curriculum will unlock next while we are already paying for a reset
+    map_cache.preload(preload_paths, simulation.tilemap.physics_size)
+    simulation.load_map(map_path)
+    return simulation
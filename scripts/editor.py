@@ -5,7 +5,8 @@ import random
 import json
 from scripts.utils import load_images, load_image, find_next_numeric_filename, MenuScreen, load_sounds, render_text_with_shadow
 from scripts.tilemap import Tilemap
-from scripts.constants import TILE_SIZE, DISPLAY_SIZE, FPS, PHYSICS_TILES, FONT, MENUBG, calculate_ui_constants, EDITOR_SCROLL_SPEED
+from scripts.assets import SpriteVariants
+from scripts.constants import TILE_SIZE, DISPLAY_SIZE, PHYSICS_TILES, FONT, MENUBG, calculate_ui_constants, EDITOR_SCROLL_SPEED
 from scripts.GameManager import game_state_manager
 
 class EditorMenu:
@@ -13,15 +14,13 @@ class EditorMenu:
         self.screen = display
         self.sfx = {'click': load_sounds('click')}
         
-        self.background = pygame.transform.scale(
-            pygame.image.load(MENUBG).convert(), 
-            DISPLAY_SIZE
-        )
+        self.background = load_image(MENUBG, scale=DISPLAY_SIZE, remove_color=None)
         
         self.UI_CONSTANTS = calculate_ui_constants(DISPLAY_SIZE)
         self.selected_map = None
         self.editor_active = False
         self.editor = None
+        self.had_input = False
         self.map_menu = EditorMapSelectionScreen(self)
         self.map_menu.enable()
 
@@ -86,10 +85,16 @@ class EditorMenu:
                 exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 self.quit_editor()
+        self.had_input = bool(events)
 
         self.map_menu.update(events)
         self.map_menu.draw(self.screen)
 
+    def is_idle(self):
+        if self.editor_active:
+            return self.editor.is_idle()
+        return not self.had_input
+
 class EditorMapSelectionScreen(MenuScreen):
     def __init__(self, menu, title="Edit a Map"):
         super().__init__(menu, title)
@@ -211,10 +216,9 @@ class EditorMapSelectionScreen(MenuScreen):
 class Editor:
     def __init__(self, menu, map_file=None):
         self.menu = menu
-        pygame.init()
         pygame.display.set_caption('editor')
-        self.display = pygame.display.set_mode(DISPLAY_SIZE)
-        self.clock = pygame.time.Clock()
+        self.display = menu.screen
+        self.had_input = False
         
         self.zoom = 10
         self.tilemap = Tilemap(self, tile_size=TILE_SIZE)
@@ -222,8 +226,6 @@ class Editor:
         self.current_map_file = map_file
         
         self.assets = self.reload_assets()
-        self.background_image = load_image('background/background.png', scale=DISPLAY_SIZE)
-        self.rotated_assets = {}
         
         # Menu system
         self.menu_width = 170
@@ -275,15 +277,6 @@ class Editor:
             thumbs[tile_type] = thumb_surf
         return thumbs
 
-    def get_rotated_image(self, tile_type, variant, rotation):
-        key = f"{tile_type}_{variant}_{rotation}"
-        
-        if key not in self.rotated_assets:
-            original = self.assets[tile_type][variant]
-            self.rotated_assets[key] = pygame.transform.rotate(original, rotation)
-        
-        return self.rotated_assets[key]
-    
     def reload_assets(self):
         IMGscale = (self.tilemap.tile_size, self.tilemap.tile_size)
         assets = {
@@ -297,7 +290,8 @@ class Editor:
             'finish_animation': load_images('tiles/finish', scale=(IMGscale[0], IMGscale[1]*2)),
             'kill': load_images('tiles/kill', scale=IMGscale),
         }
-        self.rotated_assets = {}
+        self.sprite_variants = SpriteVariants()
+        self.sprite_variants.add_rotations('spikes', assets['spikes'])
         return assets
     
     def setZoom(self, zoom):
@@ -655,7 +649,7 @@ class Editor:
                 # Don't show rotation in menu for spikes
                 display_img = (pygame.transform.scale(tile_img, (30, 30)) 
                              if current_type != 'spikes' or self.current_rotation == 0
-                             else pygame.transform.scale(self.get_rotated_image(current_type, variant, 0), (30, 30)))
+                             else pygame.transform.scale(self.sprite_variants.rotated(current_type, variant, 0), (30, 30)))
                 
                 menu_surf.blit(display_img, (5 + x_index * 34, 125 + y_index * 34))
 
@@ -688,55 +682,59 @@ class Editor:
         self.display.blit(controls, (ui_x, DISPLAY_SIZE[1] - 30))
         
     def run(self):
-        while True:
-            self.display.fill((20, 20, 20))
-            
-            render_scroll = self.update_scroll()
-            
-            # Draw grid and tilemap
-            self.draw_grid()
-            self.tilemap.render(self.display, offset=render_scroll, zoom=self.zoom)
-            
-            # Get current tile and mouse position
+        # One frame per call, the engine owns the loop and its pacing
+        self.display.fill((20, 20, 20))
+        
+        render_scroll = self.update_scroll()
+        
+        # Draw grid and tilemap
+        self.draw_grid()
+        self.tilemap.render(self.display, offset=render_scroll, zoom=self.zoom)
+        
+        # Get current tile and mouse position
+        if self.tile_list[self.tile_group] == 'spikes':
+            current_tile_img = self.sprite_variants.rotated('spikes', self.tile_variant, self.current_rotation).copy()
+        else:
             current_tile_img = self.assets[self.tile_list[self.tile_group]][self.tile_variant].copy()
+        
+        current_tile_img.set_alpha(100)
+        
+        mpos = pygame.mouse.get_pos()
+        tile_pos = (int((mpos[0] + self.scroll[0]) // self.tilemap.tile_size), 
+                   int((mpos[1] + self.scroll[1]) // self.tilemap.tile_size))
+        
+        # Show tile preview and handle placement/removal outside menu
+        if mpos[0] >= self.menu_width:
+            if self.ongrid:
+                self.display.blit(current_tile_img, 
+                                (tile_pos[0] * self.tilemap.tile_size - self.scroll[0], 
+                                 tile_pos[1] * self.tilemap.tile_size - self.scroll[1]))
+            else:
+                self.display.blit(current_tile_img, mpos)
+        
+            self.handle_tile_placement(tile_pos, mpos)
+            self.handle_tile_removal(tile_pos, mpos)
+        
+        # Draw UI elements
+        self.draw_menu()
+        self.draw_ui(current_tile_img)
+        self.draw_save_notification()
+        
+        # Handle events
+        events = pygame.event.get()
+        self.had_input = bool(events)
+        for event in events:
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
             
-            if self.tile_list[self.tile_group] == 'spikes':
-                current_tile_img = pygame.transform.rotate(current_tile_img, self.current_rotation)
-            
-            current_tile_img.set_alpha(100)
-            
-            mpos = pygame.mouse.get_pos()
-            tile_pos = (int((mpos[0] + self.scroll[0]) // self.tilemap.tile_size), 
-                       int((mpos[1] + self.scroll[1]) // self.tilemap.tile_size))
-            
-            # Show tile preview and handle placement/removal outside menu
-            if mpos[0] >= self.menu_width:
-                if self.ongrid:
-                    self.display.blit(current_tile_img, 
-                                    (tile_pos[0] * self.tilemap.tile_size - self.scroll[0], 
-                                     tile_pos[1] * self.tilemap.tile_size - self.scroll[1]))
-                else:
-                    self.display.blit(current_tile_img, mpos)
-            
-                self.handle_tile_placement(tile_pos, mpos)
-                self.handle_tile_removal(tile_pos, mpos)
-            
-            # Draw UI elements
-            self.draw_menu()
-            self.draw_ui(current_tile_img)
-            self.draw_save_notification()
-            
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if self.handle_keyboard_events(event):
-                    return 
-                
-                self.handle_mouse_events(event, tile_pos, mpos)
+            if self.handle_keyboard_events(event):
+                return 
             
-            pygame.display.update()
-            self.clock.tick(FPS)
-            
\ No newline at end of file
+            self.handle_mouse_events(event, tile_pos, mpos)
+
+    def is_idle(self):
+        # Scrolling, dragging and the save banner all change the picture without new events
+        return not (self.had_input or any(self.movement) or self.clicking or self.right_clicking or self.show_save_message)
+
+        
\ No newline at end of file
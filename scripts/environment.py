@@ -1,3 +1,4 @@
+import time
 import pygame
 import random
 import os
@@ -6,14 +7,35 @@ from scripts.GameManager import game_state_manager
 from scripts.constants import *
 from scripts.player import Player
 from scripts.humanagent import InputHandler
-from scripts.tilemap import Tilemap
+from scripts.aiagent import AIController
+from scripts.tilemap import Tilemap, map_cache
+from scripts.physics import create_physics
 from scripts.GameTimer import GameTimer
+from scripts.assets import asset_registry, AssetStream, SpriteVariants
+from scripts.audio import AudioConsumer
+from scripts.events import EventBuffer
+from scripts.hud import HudText, get_font, hud_text
+from scripts.profiler import profiler, ProfilerOverlay
+from scripts.telemetry import telemetry
 from scripts.utils import (
-    load_image, load_images, Animation, load_sounds, 
+    load_images, Animation, animation_clock, DEBUG_LABEL_POS, DEBUG_LABEL_SIZE,
     draw_debug_info, update_camera_smooth, MenuScreen,
     calculate_ui_constants, scale_font
 )
 
+TILE_FOLDERS = ('decor', 'grass', 'stone', 'pinkrock', 'spawners', 'spikes', 'kill')
+PLAYER_FOLDERS = (
+    'finish', 'run', 'idle', 'wallslide', 'wallcollide',
+    'jump_anticipation', 'jump_peak', 'jump_rising', 'jump_falling', 'jump_land',
+)
+SFX_FOLDERS = {
+    'death': ('death', 0.2),
+    'jump': ('jump', 0.05),
+    'collide': ('wallcollide', 0.05),
+    'finish': ('level_complete', 0.1),
+    'click': ('click', 0.05),
+}
+
 class PauseMenuScreen(MenuScreen):
     def initialize(self):
         self.title = "Game Paused"
@@ -67,10 +89,14 @@ class GameMenu:
         self.level_complete_menu = LevelCompleteMenuScreen(self, "Level Complete!")
         self.congratulations_menu = CongratulationsScreen(self, "Congratulations!")
         self.active_menu = None
+        
+        # Dims the paused game, built once instead of every frame
+        self.overlay = pygame.Surface(self.display_size, pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 175))
     
     def _play_sound(self, sound_key):
         if sound_key in self.environment.sfx:
-            random.choice(self.environment.sfx[sound_key]).play()
+            self.environment.ui_rng.choice(self.environment.sfx[sound_key]).play()
     
     def resume_game(self):
         self.environment.menu = False
@@ -127,41 +153,62 @@ class GameMenu:
     
     def draw(self, surface):
         if self.active_menu:
-            # Semi-transparent overlay
-            overlay = pygame.Surface(self.display_size, pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 175))
-            surface.blit(overlay, (0, 0))
+            surface.blit(self.overlay, (0, 0))
             self.active_menu.draw(surface)
 
 from scripts.stars import StarsAnimated
+from scripts.background import ParallaxBackground, map_theme, theme_keys
 class Environment:
-    def __init__(self, display, clock, ai_train_mode=False):
+    def __init__(self, display, clock, ai_train_mode=False, seed=None):
         self.player_type = game_state_manager.player_type
+        # Separate streams so menu clicks or star placement never shift the simulation's draws
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.ui_rng = random.Random(f'{self.seed}:ui')
         self.ai_train_mode = ai_train_mode if not self.player_type == 1 else True
         self.display = display
+        # The world can be drawn smaller than the window and upscaled in one pass
+        self.render_size = (int(DISPLAY_SIZE[0] * RENDER_SCALE), int(DISPLAY_SIZE[1] * RENDER_SCALE))
+        self.world = display if self.render_size == DISPLAY_SIZE else pygame.Surface(self.render_size).convert()
+        self.player_image_size = (int(PLAYERS_IMAGE_SIZE[0] * RENDER_SCALE), int(PLAYERS_IMAGE_SIZE[1] * RENDER_SCALE))
         self.clock = clock
         self.menu = False
         # Game state variables
-        self.death_sound_played = False
-        self.finish_sound_played = False
         self.countframes  = 0
+        self.frame = 0
         self.debug_mode = False
         self.movement_started = False
         self.scroll = [0, 0]
         self.render_scroll = [0, 0]
-        self.rotated_assets = {}
         self.show_rotation_values = False
 
         # Initialize fonts
         pygame.font.init()
-        self.fps_font = pygame.font.Font(FONT, scale_font(36, DISPLAY_SIZE))
-        self.timer_font = pygame.font.Font(FONT, scale_font(24, DISPLAY_SIZE))
+        self.fps_font = get_font(FONT, scale_font(36, DISPLAY_SIZE))
+        self.timer_font = get_font(FONT, scale_font(24, DISPLAY_SIZE))
+        self.timer_text = HudText(self.timer_font, (255, 255, 255), shadow=(0, 0, 0), volatile=True)
+        self.fps_text = HudText(self.fps_font, (255, 255, 0))
+        self.profiler_overlay = ProfilerOverlay(profiler)
+        # Below the hitbox status line, which is drawn on the world and grows with the upscale
+        label_bottom = DEBUG_LABEL_POS[1] + get_font(FONT, DEBUG_LABEL_SIZE).get_linesize()
+        upscale = DISPLAY_SIZE[1] / self.render_size[1] if HUD_NATIVE else 1
+        self.profiler_pos = (DEBUG_LABEL_POS[0], int(label_bottom * upscale) + 10)
         
         # Initialize components
-        self.tilemap = Tilemap(self, tile_size=TILE_SIZE)
+        self.physics = create_physics()
+        self.tilemap = Tilemap(self, tile_size=int(TILE_SIZE * RENDER_SCALE), physics_size=self.physics.tile_units)
         self.timer = GameTimer()
-        self.load_current_map()
+        self.events = EventBuffer()
+        self.animation_clock = animation_clock
+        self.player = None
+        self.begin_loading()
+        self.audio = AudioConsumer(self.sfx, random.Random(f'{self.seed}:audio')) if display is not None else None
         self.input_handler = InputHandler()
+        self.ai_controller = AIController.from_file(AI_POLICY_PATH, self.physics) if self.player_type == 1 else None
+        self.recorder = None
+        if RECORD_DEMOS and not self.ai_train_mode:
+            from scripts.recorder import DemoRecorder
+            self.recorder = DemoRecorder(DEMO_DIR, self.physics)
         self.game_menu = GameMenu(self)
 
     def update_timer(self):
@@ -182,29 +229,66 @@ class Environment:
         
         self.timer.update()
     
-    def render_timer(self):
+    def render_timer(self, surface):
         timer_pos = (25, 10)
         display_time = self.timer.final_time if not self.timer.is_running else self.timer.current_time
-        time_str = self.timer.format_time(display_time)
-        timer_text = self.timer_font.render(time_str, True, (255, 255, 255))
-        
-        # Simple shadow effect
-        shadow_text = self.timer_font.render(time_str, True, (0, 0, 0))
-        self.display.blit(shadow_text, (timer_pos[0] + 2, timer_pos[1] + 2))
-        self.display.blit(timer_text, timer_pos)
+        self.timer_text.draw(surface, self.timer.format_time(display_time), timer_pos)
 
     def reset_timer(self):
         self.timer.reset()
         self.movement_started = False
 
 
+    def begin_loading(self):
+        # Decode on a worker thread so the window keeps drawing, the first frame only waits for images
+        tile_scale = (self.tilemap.tile_size, self.tilemap.tile_size)
+        images = []
+        for folder in TILE_FOLDERS:
+            images += asset_registry.keys(f'tiles/{folder}', tile_scale)
+        images += asset_registry.keys('stars', tile_scale)
+        images += asset_registry.keys('tiles/finish', (self.tilemap.tile_size, self.tilemap.tile_size * 2))
+        for folder in PLAYER_FOLDERS:
+            images += asset_registry.keys(f'player/{folder}', self.player_image_size)
+        images += asset_registry.keys('player/death', (self.player_image_size[0] * 2, self.player_image_size[1]))
+        images += theme_keys(map_theme(game_state_manager.selected_map), self.render_size)
+
+        # Filled in place as sounds arrive, effects simply stay quiet until then
+        self.sfx = {}
+        self.loading = AssetStream(images, SFX_FOLDERS, self.sfx)
+
+    def poll_loading(self, budget_ms=ASSET_STREAM_BUDGET_MS):
+        """Convert streamed assets, returns True once the first frame can be drawn"""
+        if self.loading is None:
+            return True
+        self.loading.pump(budget_ms)
+        if self.player is None and self.loading.images_ready:
+            self.load_current_map()
+        if self.loading.done:
+            self.loading = None
+        return self.player is not None
+
+    def render_loading(self):
+        self.display.fill((0, 0, 0))
+        width, height = self.display.get_size()
+        bar = pygame.Rect(0, 0, width // 3, max(4, height // 90))
+        bar.center = (width // 2, height // 2)
+        pygame.draw.rect(self.display, (80, 80, 80), bar)
+        pygame.draw.rect(self.display, (255, 255, 255), (bar.x, bar.y, int(bar.width * self.loading.progress), bar.height))
+
+        text = hud_text(self.timer_font, (255, 255, 255)).render('Loading...')
+        self.display.blit(text, text.get_rect(midbottom=(bar.centerx, bar.y - 10)))
+
     def load_current_map(self):
+        started = time.perf_counter()
         map_path = game_state_manager.selected_map
-        self.tilemap.load(map_path)
+        compiled = map_cache.get(map_path, self.tilemap.physics_size)
+        self.tilemap.load_compiled(compiled)
         IMGscale = (self.tilemap.tile_size, self.tilemap.tile_size)
 
         finish_scale = (self.tilemap.tile_size, self.tilemap.tile_size * 2)
 
+        jump_land_frames = load_images('player/jump_land', scale=self.player_image_size)
+
         # Load assets
         self.assets = {          
             'decor': load_images('tiles/decor', scale=IMGscale),
@@ -216,82 +300,78 @@ class Environment:
             'finish': Animation(load_images('tiles/finish', scale=finish_scale), img_dur=5, loop=True),
             'kill': load_images('tiles/kill', scale=IMGscale),
             'stars': load_images('stars', scale=IMGscale), 
-            'player/finish': Animation(load_images('player/finish', scale=PLAYERS_IMAGE_SIZE), img_dur=10, loop=False),
-            'player/run': Animation(load_images('player/run', scale=PLAYERS_IMAGE_SIZE), img_dur=5),
-            'player/idle': Animation(load_images('player/idle', scale=PLAYERS_IMAGE_SIZE), img_dur=25),
-            'player/wallslide': Animation(load_images('player/wallslide', scale=PLAYERS_IMAGE_SIZE), loop=False),
-            'player/wallcollide': Animation(load_images('player/wallcollide', scale=PLAYERS_IMAGE_SIZE), loop=False),
+            'player/finish': Animation(load_images('player/finish', scale=self.player_image_size), img_dur=10, loop=False),
+            'player/run': Animation(load_images('player/run', scale=self.player_image_size), img_dur=5),
+            'player/idle': Animation(load_images('player/idle', scale=self.player_image_size), img_dur=25),
+            'player/wallslide': Animation(load_images('player/wallslide', scale=self.player_image_size), loop=False),
+            'player/wallcollide': Animation(load_images('player/wallcollide', scale=self.player_image_size), loop=False),
             'player/jump_anticipation': Animation(
-                load_images('player/jump_anticipation', scale=PLAYERS_IMAGE_SIZE),
+                load_images('player/jump_anticipation', scale=self.player_image_size),
                 img_dur=2,  
                 loop=False  
             ),
             'player/jump_peak': Animation(
-                load_images('player/jump_peak', scale=PLAYERS_IMAGE_SIZE),
+                load_images('player/jump_peak', scale=self.player_image_size),
                 img_dur=6,  
                 loop=False
             ),
             'player/jump_rising': Animation(
-                load_images('player/jump_rising', scale=PLAYERS_IMAGE_SIZE),  
+                load_images('player/jump_rising', scale=self.player_image_size),  
                 img_dur=8, 
                 loop=False
             ),
             'player/jump_landing': Animation(
-                load_images('player/jump_land', scale=PLAYERS_IMAGE_SIZE),
+                jump_land_frames,
                 img_dur=10,  
                 loop=False 
             ),
             'player/jump_falling': Animation(
-                load_images('player/jump_falling', scale=PLAYERS_IMAGE_SIZE),
+                load_images('player/jump_falling', scale=self.player_image_size),
                 img_dur=4, 
                 loop=False 
             ),
             'player/jump_land': Animation(
-                load_images('player/jump_land', scale=PLAYERS_IMAGE_SIZE),
+                jump_land_frames,
                 img_dur=4,  
                 loop=False  
             ),
-            'player/death': Animation(load_images('player/death', scale=(PLAYERS_IMAGE_SIZE[0]*2, PLAYERS_IMAGE_SIZE[1])), img_dur=6, loop=False),
+            'player/death': Animation(load_images('player/death', scale=(self.player_image_size[0]*2, self.player_image_size[1])), img_dur=6, loop=False),
         }
 
+        self.sprite_variants = SpriteVariants()
+        self.sprite_variants.add_rotations('spikes', self.assets['spikes'])
+        for name, clip in self.assets.items():
+            if name.startswith('player/'):
+                self.sprite_variants.add_mirrors(name, clip.images)
+
         star_images = self.assets['stars']  # this is a list of images
-        self.stars = StarsAnimated(star_images, display_size=DISPLAY_SIZE, count=25, min_dist=200)
+        self.stars = StarsAnimated(star_images, display_size=self.render_size, clock=self.animation_clock, count=STAR_COUNT, min_dist=STAR_MIN_DIST,
+                                   rng=random.Random(f'{self.seed}:stars'))
 
-        
-        background_path = 'background/background.png'
-        self.background = load_image(background_path, scale=DISPLAY_SIZE, remove_color=None)
-
-        # Load sounds
-        self.sfx = {
-            'death': load_sounds('death', volume=0.2),
-            'jump': load_sounds('jump'),
-            'collide': load_sounds('wallcollide'),
-            'finish': load_sounds('level_complete', volume=0.1),
-            'click': load_sounds('click'),
-        }
+        self.background = ParallaxBackground(map_theme(map_path), self.render_size)
 
         # Setup player
-        self.pos = self.tilemap.extract([('spawners', 0), ('spawners', 1)])
-        self.default_pos = self.pos[0]['pos'].copy() if self.pos else [10, 10]
-        self.player = Player(self, self.default_pos.copy(), (PLAYERS_SIZE[0], PLAYERS_SIZE[1]), self.sfx)
+        self.default_pos = self.physics.to_units(compiled['spawn'])
+        self.player = Player(self, self.default_pos.copy(), self.physics.player_size)
         
         self.center_scroll_on_player()
         self.keys = {'left': False, 'right': False, 'jump': False}
         self.buffer_times = {'jump': 0}
+        telemetry.map_loaded(map_path, time.perf_counter() - started)
     
     def center_scroll_on_player(self):
-        player_rect = self.player.rect()
-        self.scroll[0] = player_rect.centerx - self.display.get_width() // 2
-        self.scroll[1] = player_rect.centery - self.display.get_height() // 2
+        player_rect = self.player.render_rect()
+        self.scroll[0] = player_rect.centerx - self.world.get_width() // 2
+        self.scroll[1] = player_rect.centery - self.world.get_height() // 2
         self.render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
     
     def reset(self):
         # Reset all state variables
-        self.death_sound_played = False
-        self.finish_sound_played = False
         self.countframes  = 0
+        self.frame = 0
         self.menu = False
         self.debug_mode = False
+        profiler.enabled = False
         
         # Reset player and input
         self.player.reset()
@@ -299,6 +379,8 @@ class Environment:
         self.keys = {'left': False, 'right': False, 'jump': False}
         self.buffer_times = {'jump': 0}
         self.input_handler = InputHandler()
+        if self.ai_controller:
+            self.ai_controller.reset()
         
         # Reset timer and camera
         self.reset_timer()
@@ -308,23 +390,24 @@ class Environment:
         self.load_map_id(0)
 
     def load_map_id(self, map_id):
-        next_map = f'data/maps/{map_id}.json'
+        self.load_map(f'data/maps/{map_id}.json')
+
+    def load_map(self, next_map):
+        started = time.perf_counter()
         game_state_manager.selected_map = next_map
         self.reset()
-        self.tilemap.load(next_map)
-        
-        # Reset the finish animation instead of calling update on non-existent animation
-        finish_scale = (self.tilemap.tile_size, self.tilemap.tile_size * 2)
-        self.assets['finish'] = Animation(load_images('tiles/finish', scale=finish_scale), img_dur=5, loop=True)
+        compiled = map_cache.get(next_map, self.tilemap.physics_size)
+        self.tilemap.load_compiled(compiled)
+        self.background = ParallaxBackground(map_theme(next_map), self.render_size)
         
         # Update spawn position
-        self.pos = self.tilemap.extract([('spawners', 0), ('spawners', 1)])
-        self.default_pos = self.pos[0]['pos'].copy() if self.pos else [10, 10]
+        self.default_pos = self.physics.to_units(compiled['spawn'])
         self.player.pos = self.default_pos.copy()
         
         self.reset_timer()
         self.center_scroll_on_player()
         self.menu = False
+        telemetry.map_loaded(next_map, time.perf_counter() - started)
 
     # def set_map_best_time(self, time):
     #     current_map = game_state_manager.selected_map
@@ -372,50 +455,44 @@ class Environment:
         else:
             self.reset()
                 
-    def get_rotated_image(self, tile_type, variant, rotation):
-        key = f"{tile_type}_{variant}_{rotation}"
-        
-        if key not in self.rotated_assets:
-            original = self.assets[tile_type][variant]
-            self.rotated_assets[key] = pygame.transform.rotate(original, rotation)
-        
-        return self.rotated_assets[key]
-    
+    def handle_pause_key(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                if not self.menu and not self.player.death and not self.player.finishLevel:
+                    self.menu = True
+                    self.game_menu.show_pause_menu()
+                elif self.menu and not self.player.death and not self.player.finishLevel:
+                    self.menu = False
+                    self.game_menu.active_menu = None
+
     def process_human_input(self, events):
         if not self.ai_train_mode:
-            # Handle escape key
-            for event in events:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    if not self.menu and not self.player.death and not self.player.finishLevel:
-                        self.menu = True
-                        self.game_menu.show_pause_menu()
-                    elif self.menu and not self.player.death and not self.player.finishLevel:
-                        self.menu = False
-                        self.game_menu.active_menu = None
-                    
+            self.handle_pause_key(events)
             self.keys, self.buffer_times = self.input_handler.process_events(events, self.menu)
+
+    def process_ai_input(self, events):
+        self.handle_pause_key(events)
+        if not self.menu and self.ai_controller:
+            self.set_action(self.ai_controller.act(self.get_state()))
+
+    def close(self):
+        if self.ai_controller:
+            self.ai_controller.close()
+            self.ai_controller = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
     
     def update(self, dt):
         self.update_timer()
         
-        # Update animations
-        self.assets['finish'].update()
-
-        self.stars.update(dt)
-        
         if self.player.death:
             self.countframes  += 1
-            if not self.death_sound_played:
-                random.choice(self.sfx['death']).play()
-                self.death_sound_played = True
             if self.countframes  >= 40:
                 self.reset()
         
         elif self.player.finishLevel:
             self.countframes  += 1
-            if not self.finish_sound_played:
-                random.choice(self.sfx['finish']).play()
-                self.finish_sound_played = True
             if self.countframes  >= 90:
                 self.menu = True
             
@@ -425,24 +502,54 @@ class Environment:
                 self.game_menu.show_congratulations_menu()
             
         if not self.menu:
+            recording = self.recorder and not self.player.death and not self.player.finishLevel
+            if recording:
+                state = self.observe()
+            self.events.clear()
+            self.animation_clock.advance()
             self.player.update(self.tilemap, self.keys, self.countframes)
-            update_camera_smooth(self.player, self.scroll, self.display.get_width(), self.display.get_height())
+            if recording:
+                self.recorder.record(state, self.keys, self.frame, self.events.mask())
+            if self.audio:
+                self.audio.consume(self.events)
+            self.frame += 1
+            telemetry.step()
+            profiler.lap('player')
+            update_camera_smooth(self.player, self.scroll, self.world.get_width(), self.world.get_height())
             self.render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
+            profiler.lap('camera')
 
     def render(self):
-        self.display.fill((0, 0, 0))
-
+        world = self.world
+        if self.background.layers:
+            self.background.render(world, offset=self.render_scroll)
+        else:
+            world.fill((0, 0, 0))
+        profiler.lap('background')
 
-        self.stars.render(self.display, offset=self.render_scroll)
+        self.stars.render(world, offset=self.render_scroll)
+        profiler.lap('stars')
 
-        self.player.render(self.display, offset=self.render_scroll)
+        self.player.render(world, offset=self.render_scroll)
+        profiler.lap('player_render')
 
-        self.render_timer()
+        if not HUD_NATIVE:
+            self.render_hud(world)
+            profiler.lap('hud')
 
-        self.tilemap.render(self.display, offset=self.render_scroll)
+        self.tilemap.render(world, offset=self.render_scroll)
 
         if self.debug_mode and not self.menu:
-            self.debug_render()
+            draw_debug_info(self, world, self.render_scroll)
+        profiler.lap('tilemap')
+
+        if world is not self.display:
+            pygame.transform.scale(world, self.display.get_size(), self.display)
+        profiler.lap('scale')
+
+        if HUD_NATIVE:
+            self.render_hud(self.display)
+            profiler.lap('hud')
         
         if self.menu:
             # Update button hover states
@@ -452,6 +559,7 @@ class Environment:
                     button.selected = button.is_hovered(mouse_pos)
                     
             self.game_menu.draw(self.display)
+        profiler.lap('menu')
 
     def process_menu_events(self, events):
         if self.menu:
@@ -465,26 +573,40 @@ class Environment:
             
             self.game_menu.update(events)
 
-    def debug_render(self):
-        draw_debug_info(self, self.display, self.render_scroll)  
-        fps = self.clock.get_fps()
-        fps_text = self.fps_font.render(f"FPS: {int(fps)}", True, (255, 255, 0))
-        self.display.blit(fps_text, (10, 80))
+    def render_hud(self, surface):
+        self.render_timer(surface)
+        if self.debug_mode and not self.menu:
+            self.fps_text.draw(surface, f"FPS: {int(self.clock.get_fps())}", (10, 80))
+            self.profiler_overlay.draw(surface, self.profiler_pos)
     
+    def profile_context(self):
+        return {
+            'map': game_state_manager.selected_map,
+            'render_size': self.render_size,
+            'tiles': len(self.tilemap.tilemap),
+            'offgrid_tiles': len(self.tilemap.offgrid_tiles),
+            'stars': len(self.stars.stars),
+            'background_layers': len(self.background.layers),
+            'frame': self.frame,
+        }
+
+    def observe(self):
+        player_rect = self.player.rect()
+        return {
+            'player_pos': (player_rect.centerx, player_rect.centery),
+            'player_vel': tuple(self.player.velocity), # copied, Player.update changes the list in place
+            'player_grounded': self.player.grounded,
+            'player_air_time': self.player.air_time,
+            'physics_tiles': self.tilemap.physics_rects_around(self.player.pos),
+            'interactive_tiles': self.tilemap.interactive_rects_around(self.player.pos),
+            'collisions': self.player.collisions,
+            'finished': self.player.finishLevel,
+            'dead': self.player.death
+        }
+
     def get_state(self):
         if self.ai_train_mode:
-            player_rect = self.player.rect()
-            return {
-                'player_pos': (player_rect.centerx, player_rect.centery),
-                'player_vel': self.player.velocity,
-                'player_grounded': self.player.grounded,
-                'player_air_time': self.player.air_time,
-                'physics_tiles': self.tilemap.physics_rects_around(self.player.pos),
-                'interactive_tiles': self.tilemap.interactive_rects_around(self.player.pos),
-                'collisions': self.player.collisions,
-                'finished': self.player.finishLevel,
-                'dead': self.player.death
-            }
+            return self.observe()
         return None
     
     def set_action(self, action):
@@ -0,0 +1,38 @@
+from collections import Counter
+
+EVENT_TYPES = ('jumped', 'landed', 'wall_hit', 'died', 'finished')
+EVENT_BITS = {name: 1 << index for index, name in enumerate(EVENT_TYPES)}
+
+class EventBuffer:
+    """Gameplay events raised during the current frame
+
+    The simulation only appends event names here. Audio, stats and the demo recorder
+    read the buffer after the step, so stepping the physics never touches the mixer.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.totals = Counter()
+
+    def emit(self, name):
+        self.events.append(name)
+        self.totals[name] += 1
+
+    def clear(self):
+        self.events.clear()
+
+    def mask(self):
+        # Compact per-frame form used by recordings, one bit per event type
+        mask = 0
+        for name in self.events:
+            mask |= EVENT_BITS[name]
+        return mask
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+def events_from_mask(mask):
+    return [name for name in EVENT_TYPES if mask & EVENT_BITS[name]]
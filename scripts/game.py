@@ -1,6 +1,9 @@
 import sys
 import pygame
 from scripts.environment import Environment
+from scripts.GameManager import game_state_manager
+from scripts.audio import music
+from scripts.profiler import profiler, capture
 from scripts.constants import *
 
 class Game:
@@ -10,11 +13,18 @@ class Game:
         self.environment = None
         
     def initialize_environment(self):
+        # Keep the loaded environment around and just switch maps unless the player type changed
+        if self.environment and self.environment.player_type == game_state_manager.player_type:
+            self.environment.load_map(game_state_manager.selected_map)
+            return
+        if self.environment:
+            self.environment.close()
         self.environment = Environment(self.display, self.clock)
 
     def run(self, dt):
         if not self.environment:
             self.initialize_environment()
+        music.play('game')
             
         events = pygame.event.get()
         for event in events:
@@ -25,12 +35,25 @@ class Game:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_F3:  
                     self.environment.debug_mode = not self.environment.debug_mode  
+                    profiler.enabled = self.environment.debug_mode
                     print(f"Debug mode: {'ON' if self.environment.debug_mode else 'OFF'}")
+                elif event.key == pygame.K_F9:
+                    capture.start()
+        
+        if not self.environment.poll_loading():
+            self.environment.render_loading()
+            return
         
         if self.environment.menu:
             self.environment.process_menu_events(events)
+        elif self.environment.ai_controller:
+            self.environment.process_ai_input(events)
         else:
             self.environment.process_human_input(events)
+        profiler.lap('input')
         
         self.environment.update(dt)
-        self.environment.render()
\ No newline at end of file
+        self.environment.render()
+
+    def profile_context(self):
+        return self.environment.profile_context() if self.environment and self.environment.player else {}
\ No newline at end of file
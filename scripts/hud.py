@@ -0,0 +1,86 @@
+import pygame
+
+_fonts = {}
+_glyph_sets = {}
+_texts = {}
+
+def get_font(path, size):
+    # pygame.font.Font parses the file on every construction, share one per size
+    key = (path, size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.Font(path, size)
+    return _fonts[key]
+
+def glyphs(font, color):
+    key = (font, tuple(color))
+    if key not in _glyph_sets:
+        _glyph_sets[key] = GlyphSet(font, color)
+    return _glyph_sets[key]
+
+def hud_text(font, color, shadow=None, shadow_offset=(2, 2)):
+    key = (font, tuple(color), shadow, shadow_offset)
+    if key not in _texts:
+        _texts[key] = HudText(font, color, shadow, shadow_offset)
+    return _texts[key]
+
+class GlyphSet:
+    """Characters of one font and colour, each rendered once"""
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.surfaces = {}
+        self.height = font.get_linesize()
+
+    def get(self, char):
+        surface = self.surfaces.get(char)
+        if surface is None:
+            surface = self.surfaces[char] = self.font.render(char, True, self.color)
+        return surface
+
+    def width(self, text):
+        return sum(self.get(char).get_width() for char in text)
+
+    def compose(self, surface, text, pos):
+        x, y = pos
+        for char in text:
+            glyph = self.get(char)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+class HudText:
+    """One line of HUD text built from cached glyphs and only rebuilt when the string changes
+
+    Volatile text (a running timer) changes every frame, so it skips the intermediate
+    surface and composes its glyphs straight onto the target instead.
+    """
+
+    def __init__(self, font, color, shadow=None, shadow_offset=(2, 2), volatile=False):
+        self.volatile = volatile
+        self.glyphs = glyphs(font, color)
+        self.shadow = glyphs(font, shadow) if shadow is not None else None
+        self.shadow_offset = shadow_offset if shadow is not None else (0, 0)
+        self.text = None
+        self.surface = None
+
+    def render(self, text):
+        if text != self.text:
+            offset_x, offset_y = self.shadow_offset
+            size = (self.glyphs.width(text) + offset_x, self.glyphs.height + offset_y)
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            if self.shadow:
+                self.shadow.compose(self.surface, text, self.shadow_offset)
+            self.glyphs.compose(self.surface, text, (0, 0))
+            self.text = text
+        return self.surface
+
+    def draw(self, surface, text, pos):
+        if not self.volatile:
+            return surface.blit(self.render(text), pos)
+
+        x, y = pos
+        offset_x, offset_y = self.shadow_offset
+        if self.shadow:
+            self.shadow.compose(surface, text, (x + offset_x, y + offset_y))
+        self.glyphs.compose(surface, text, pos)
+        return pygame.Rect(x, y, self.glyphs.width(text) + offset_x, self.glyphs.height + offset_y)
@@ -2,26 +2,22 @@ import pygame
 import random
 import os
 import json
-from scripts.constants import DISPLAY_SIZE, FONT, MENUBG    
-from scripts.utils import load_sounds, MenuScreen, render_text_with_shadow
+from scripts.constants import DISPLAY_SIZE, FONT, MENUBG, AI_POLICY_PATH
+from scripts.utils import load_sounds, load_image, MenuScreen, render_text_with_shadow
 from scripts.GameManager import game_state_manager
-from scripts.utils import calculate_ui_constants
+from scripts.utils import calculate_ui_constants, build_layer
+from scripts.audio import music
 
 class Menu:
     def __init__(self, screen):
         pygame.font.init()
         
         self.screen = screen
-        self.sfx = {
-            'click': load_sounds('click'),
-            'music': pygame.mixer.Sound('data/sfx/music/music.mp3')
-        }  
-        self.played_music = False
+        self.sfx = {'click': load_sounds('click')}
          
         self.UI_CONSTANTS = calculate_ui_constants(DISPLAY_SIZE)
         
-        self.background = pygame.image.load(MENUBG)
-        self.background = pygame.transform.scale(self.background, DISPLAY_SIZE)
+        self.background = load_image(MENUBG, scale=DISPLAY_SIZE, remove_color=None)
         
         
         self.player_type = game_state_manager.player_type
@@ -34,6 +30,7 @@ class Menu:
         
         
         self.active_menu = None
+        self.had_input = False
         self.main_menu.enable()
         self.active_menu = self.main_menu
         
@@ -96,6 +93,7 @@ class Menu:
         self._play_sound('click')
 
     def run(self):
+        music.play('menu')
         self.screen.blit(self.background, (0, 0))
 
         events = pygame.event.get()
@@ -106,12 +104,14 @@ class Menu:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self._handle_escape()
-
-        pygame.time.Clock().tick(20)  
+        self.had_input = bool(events)
 
         self.active_menu.update(events)
         self.active_menu.draw(self.screen)
 
+    def is_idle(self):
+        return not self.had_input and not getattr(self.active_menu, 'is_flashing', False)
+
 class MainMenuScreen(MenuScreen):
     def initialize(self):
         self.title = "Super Terboy"
@@ -123,6 +123,7 @@ class MainMenuScreen(MenuScreen):
         header_font_size = int(DISPLAY_SIZE[1] * 0.025)  
         self.info_font = pygame.font.Font(FONT, info_font_size)
         self.header_font = pygame.font.Font(FONT, header_font_size)
+        self.info_layer = None
         
         self.clear_buttons()
         left_x = int(DISPLAY_SIZE[0] * 0.1)  # 10% from left
@@ -160,27 +161,13 @@ class MainMenuScreen(MenuScreen):
         super().draw(surface)
         
         if self.is_flashing and len(self.buttons) > self.train_ai_button_index:
-            button = self.buttons[self.train_ai_button_index]
-            glow_color = (255, 60, 60)  
-            glow_size = int(3 * (DISPLAY_SIZE[0] / 1920))  
-
-            for i in range(glow_size, 0, -1):
-                alpha = 120 - i * 15
-                glow_rect = button.rect.inflate(i * 4, i * 4)
-                glow_surface = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
-                
-                pygame.draw.rect(
-                    glow_surface,
-                    (*glow_color, alpha),
-                    glow_surface.get_rect(),
-                    border_radius=6
-                )
-                surface.blit(glow_surface, (
-                    button.rect.x - i * 2,
-                    button.rect.y - i * 2
-                ))
-        
-        self.draw_info_text(surface)
+            self.draw_flash(surface, self.buttons[self.train_ai_button_index])
+        
+        # The controls panel never changes, compose it once
+        if self.buttons:
+            if self.info_layer is None:
+                self.info_layer = build_layer(DISPLAY_SIZE, self.draw_info_text)
+            surface.blit(*self.info_layer)
     
     def draw_info_text(self, surface):
         if not self.buttons:
@@ -314,8 +301,13 @@ class OptionsMenuScreen(MenuScreen):
         center_x = DISPLAY_SIZE[0] // 2
 
         def toggle_player_type():
-            self.menu._set_player_type(0)  
-            self.flash_player_type_button()
+            # AI mode needs a trained policy on disk
+            if os.path.exists(AI_POLICY_PATH):
+                self.menu._set_player_type(1 - self.menu.player_type)
+                self.initialize()
+            else:
+                self.menu._set_player_type(0)
+                self.flash_player_type_button()
 
         
         start_y = int(DISPLAY_SIZE[1] * 0.3)  
@@ -354,25 +346,7 @@ class OptionsMenuScreen(MenuScreen):
         
         
         if self.is_flashing and len(self.buttons) > self.player_type_button_index:
-            button = self.buttons[self.player_type_button_index]
-            glow_color = (255, 60, 60)  
-            glow_size = int(3 * (DISPLAY_SIZE[0] / 1920))  
-
-            for i in range(glow_size, 0, -1):
-                alpha = 120 - i * 15
-                glow_rect = button.rect.inflate(i * 4, i * 4)
-                glow_surface = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
-                
-                pygame.draw.rect(
-                    glow_surface,
-                    (*glow_color, alpha),
-                    glow_surface.get_rect(),
-                    border_radius=6
-                )
-                surface.blit(glow_surface, (
-                    button.rect.x - i * 2,
-                    button.rect.y - i * 2
-                ))
+            self.draw_flash(surface, self.buttons[self.player_type_button_index])
 
 class MapSelectionScreen(MenuScreen):
     def __init__(self, menu, title="Select a Map"):
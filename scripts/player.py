@@ -1,13 +1,20 @@
 from scripts.constants import *
-import random
 import pygame
 
+# Plain-value attributes that fully describe the physics state of a player
+SNAPSHOT_FIELDS = (
+    'air_time', 'grounded', 'facing_right', 'jump_available', 'coyote_time',
+    'death', 'finishLevel', 'respawn', 'was_colliding_wall', 'wall_contact_time',
+    'wall_momentum_active', 'animation_priority', 'animation_lock_timer',
+    'jump_phase', 'jump_frame_counter', 'was_grounded_last_frame', 'landing_buffer',
+)
+
 class Player:
-    def __init__(self, game, pos, size, sfx):
+    def __init__(self, game, pos, size):
         self.game = game
+        self.physics = game.physics
         self.start_pos = pos
         self.size = size
-        self.sfx = sfx
         self._initialize()
 
     def _initialize(self):
@@ -40,18 +47,52 @@ class Player:
 
     def reset(self):
         self._initialize()
+
+    def snapshot(self):
+        return (
+            tuple(self.pos),
+            tuple(self.velocity),
+            tuple(self.collisions.items()),
+            tuple(getattr(self, field) for field in SNAPSHOT_FIELDS),
+            (self.action, self.animation_elapsed()),
+        )
+
+    def restore(self, snapshot):
+        pos, velocity, collisions, fields, animation = snapshot
+        self.pos = list(pos)
+        self.velocity = list(velocity)
+        self.collisions = dict(collisions)
+        for field, value in zip(SNAPSHOT_FIELDS, fields):
+            setattr(self, field, value)
+
+        self.action, elapsed = animation
+        self.animation = self.game.assets['player/' + self.action]
+        self.animation_start = self.game.animation_clock.tick - elapsed
         
     def rect(self):
         return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+
+    def render_rect(self):
+        # Hitbox in screen pixels, physics may run in its own units
+        tile_size = self.game.tilemap.tile_size
+        to_pixels = self.physics.to_pixels
+        return pygame.Rect(
+            to_pixels(self.pos[0], tile_size), to_pixels(self.pos[1], tile_size),
+            to_pixels(self.size[0], tile_size), to_pixels(self.size[1], tile_size)
+        )
     
     def set_action(self, action, priority=0, lock_frames=0):
         if action != self.action or priority > self.animation_priority:
             if self.animation_lock_timer <= 0 or priority > self.animation_priority:
                 self.action = action
-                self.animation = self.game.assets['player/' + self.action].copy()
+                self.animation = self.game.assets['player/' + self.action]
+                self.animation_start = self.game.animation_clock.tick
                 self.animation_priority = priority
                 self.animation_lock_timer = lock_frames
     
+    def animation_elapsed(self):
+        return self.game.animation_clock.tick - self.animation_start
+
     def can_coyote_jump(self):
         return self.coyote_time <= COYOTE_TIME and not self.grounded
     
@@ -62,18 +103,18 @@ class Player:
             if self.jump_frame_counter >= 2:
                 self.jump_phase = 'rising'
                 self.jump_frame_counter = 0
-                self.velocity[1] = -JUMP_SPEED  # Apply jump force after anticipation
+                self.velocity[1] = -self.physics.jump_speed  # Apply jump force after anticipation
                 
         elif self.jump_phase == 'rising':
             # Transition to peak when upward velocity slows down
-            if self.velocity[1] >= -2:  # -2 is the velocity threshold for peak transition
+            if self.velocity[1] >= -self.physics.peak_velocity:  # velocity threshold for peak transition
                 self.jump_phase = 'peak'
                 self.jump_frame_counter = 0
                 
         elif self.jump_phase == 'peak':
             self.jump_frame_counter += 1
             # Stay in peak for minimum 6 frames OR until clearly falling
-            if self.jump_frame_counter >= 6 and self.velocity[1] > 1:
+            if self.jump_frame_counter >= 6 and self.velocity[1] > self.physics.fall_velocity:
                 self.jump_phase = 'falling'
                 self.jump_frame_counter = 0
                 
@@ -128,27 +169,28 @@ class Player:
         
         # Medium priority: Air states (when not in jump sequence)
         if not self.grounded:
-            if self.velocity[1] < -1:
+            if self.velocity[1] < -self.physics.air_velocity:
                 return 'jump_rising', 70, 0  # Default rising animation
-            elif self.velocity[1] > 1:
+            elif self.velocity[1] > self.physics.air_velocity:
                 return 'jump_falling', 70, 0  # Default falling animation
             else:
                 return 'jump_peak', 70, 0  # Default peak animation
         
         # Low priority: Ground movement
-        if abs(self.velocity[0]) > 0.5:
+        if abs(self.velocity[0]) > self.physics.run_velocity:
             return 'run', 10, 0
         else:
             return 'idle', 5, 0
 
     def update(self, tilemap, keys, countframes):
+        physics = self.physics
         # Update animation timer
         if self.animation_lock_timer > 0:
             self.animation_lock_timer -= 1
-        
-        self.animation.update()
 
         if tilemap.is_below_map(self.pos):
+            if not self.death:
+                self.game.events.emit('died')
             self.death = True
             self.velocity = [0, 0]
             self.set_action('death', 100)
@@ -162,12 +204,12 @@ class Player:
         
         self.collisions = {'up': False, 'down': False, 'right': False, 'left': False}
         if not self.death and not self.finishLevel:
-            self.velocity[0] += (int(keys['right']) - int(keys['left'])) * PLAYER_SPEED
-            x_acceleration = (1 - DECCELARATION) if int(keys['right']) - int(keys['left']) == 0 else (1 - ACCELERAION)
-            self.velocity[0] = max(-MAX_X_SPEED, min(MAX_X_SPEED, self.velocity[0] * x_acceleration))
+            self.velocity[0] += (int(keys['right']) - int(keys['left'])) * physics.player_speed
+            x_acceleration = physics.stop_friction if int(keys['right']) - int(keys['left']) == 0 else physics.move_friction
+            self.velocity[0] = max(-physics.max_x_speed, min(physics.max_x_speed, physics.scale(self.velocity[0], x_acceleration)))
 
-            gravity = GRAVITY_DOWN if self.velocity[1] > 0 and not keys['jump'] else GRAVITY_UP
-            self.velocity[1] = max(-MAX_Y_SPEED, min(MAX_Y_SPEED, self.velocity[1] + gravity))
+            gravity = physics.gravity_down if self.velocity[1] > 0 and not keys['jump'] else physics.gravity_up
+            self.velocity[1] = max(-physics.max_y_speed, min(physics.max_y_speed, self.velocity[1] + gravity))
         else:
             self.velocity[0] = 0    
             self.velocity[1] = 0
@@ -203,11 +245,15 @@ class Player:
             if entity_rect.colliderect(rect):
                 tile_type = tile_info[0]
                 if tile_type in ['spikes', 'saws', 'kill']:
+                    if not self.death:
+                        self.game.events.emit('died')
                     self.death = True 
                     self.velocity = [0, 0]
                     self.set_action('death', 100)
                     return
                 elif tile_type == 'finish':
+                    if not self.finishLevel:
+                        self.game.events.emit('finished')
                     self.finishLevel = True
 
         # Update facing direction
@@ -224,10 +270,9 @@ class Player:
         if (self.collisions['left'] or self.collisions['right']) and self.grounded:
             self.velocity[0] = 0
 
-        # Wall collision sound
         now_colliding_wall = self.collisions['left'] or self.collisions['right']
         if now_colliding_wall and not self.was_colliding_wall:  
-            random.choice(self.sfx['collide']).play()
+            self.game.events.emit('wall_hit')
         self.was_colliding_wall = now_colliding_wall
 
         # Update grounded state and air time
@@ -239,6 +284,8 @@ class Player:
             self.coyote_time = 0
         
         self.grounded = self.air_time <= 4
+        if self.grounded and not was_grounded:
+            self.game.events.emit('landed')
         
         # Update coyote time
         if was_grounded and not self.grounded:
@@ -256,16 +303,16 @@ class Player:
             
             # Wall jump logic
             if not self.grounded and (self.collisions['left'] or self.collisions['right']):
-                self.velocity[1] = -WALLJUMP_Y_SPEED
+                self.velocity[1] = -physics.walljump_y_speed
                 if self.collisions['right']: 
-                    self.velocity[0] = -WALLJUMP_X_SPEED
+                    self.velocity[0] = -physics.walljump_x_speed
                 if self.collisions['left']: 
-                    self.velocity[0] = WALLJUMP_X_SPEED
+                    self.velocity[0] = physics.walljump_x_speed
                 
                 # Start wall jump animation sequence
                 self.jump_phase = 'rising'
                 self.jump_frame_counter = 0
-                random.choice(self.sfx['jump']).play()
+                self.game.events.emit('jumped')
             
             # Regular jump logic (includes coyote jump)
             elif (self.grounded or self.can_coyote_jump()) and self.game.buffer_times['jump'] <= PLAYER_BUFFER:
@@ -273,11 +320,11 @@ class Player:
                 self.jump_phase = 'anticipation'
                 self.jump_frame_counter = 0
                 
-                self.velocity[1] = -JUMP_SPEED
+                self.velocity[1] = -physics.jump_speed
                 self.air_time = 5
                 self.grounded = False
                 self.coyote_time = COYOTE_TIME + 1
-                random.choice(self.sfx['jump']).play()
+                self.game.events.emit('jumped')
         
         # Update jump animation state machine
         self.update_jump_animation_state()
@@ -292,11 +339,11 @@ class Player:
             self.wall_contact_time += 1
             
             if self.wall_momentum_active and self.wall_contact_time <= WALL_MOMENTUM_FRAMES:
-                self.velocity[1] *= WALL_MOMENTUM_PRESERVE
+                self.velocity[1] = physics.scale(self.velocity[1], physics.wall_momentum)
             else:
                 self.wall_momentum_active = False
                 if self.velocity[1] > 0:  
-                    self.velocity[1] = min(WALLSLIDE_SPEED, self.velocity[1])
+                    self.velocity[1] = min(physics.wallslide_speed, self.velocity[1])
         
         # Cut jump short if key released
         if not keys['jump'] and self.velocity[1] < 0:
@@ -307,15 +354,13 @@ class Player:
         self.set_action(animation_state, priority, lock_frames)
         
     def render(self, surf, offset=(0, 0)):
-        # Get the original image
-        image = self.animation.img()
-        
-        # Flip the image horizontally if facing left
-        if not self.facing_right:
-            image = pygame.transform.flip(image, True, False)
+        # Mirrored frames were built at load time
+        frames = self.game.sprite_variants.facing('player/' + self.action, not self.facing_right)
+        image = frames[self.animation.index(self.animation_elapsed())]
         
         # Get the rectangle of the rotated image
-        image_rect = image.get_rect(center=(self.pos[0] + self.size[0] // 2 - offset[0],
-                                                self.pos[1] + self.size[1] // 2 - offset[1]))
+        render_rect = self.render_rect()
+        image_rect = image.get_rect(center=(render_rect.x + render_rect.width // 2 - offset[0],
+                                                render_rect.y + render_rect.height // 2 - offset[1]))
         # Draw the rotated image
         surf.blit(image, image_rect)
\ No newline at end of file
@@ -0,0 +1,199 @@
+import io
+import os
+import time
+import json
+import pstats
+import cProfile
+import tracemalloc
+from array import array
+from datetime import datetime
+import pygame
+from scripts.constants import (
+    FONT, FPS, DISPLAY_SIZE, PROFILER_WINDOW, PROFILER_REFRESH, PROFILE_FRAMES, PROFILE_TRACEMALLOC, PROFILE_DIR
+)
+from scripts.hud import get_font, HudText
+from scripts.utils import scale_font
+from scripts.telemetry import percentile
+
+PHASES = ('input', 'player', 'camera', 'background', 'stars', 'player_render', 'tilemap', 'scale', 'hud', 'menu', 'flip')
+
+class FrameProfiler:
+    """Times each phase of a frame into fixed-size ring buffers
+
+    lap(phase) books the time since the previous lap to that phase, so instrumented code
+    only needs one call after each section. Everything is a no-op while disabled.
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.samples = {phase: array('d', [0.0]) * window for phase in PHASES}
+        self.totals = array('d', [0.0]) * window
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.index = 0
+        self.count = 0
+        self.enabled = False
+        self.active = False
+        self.last = 0.0
+
+    def begin_frame(self):
+        self.active = self.enabled
+        if self.active:
+            for phase in PHASES:
+                self.current[phase] = 0.0
+            self.last = time.perf_counter()
+
+    def lap(self, phase):
+        if self.active:
+            now = time.perf_counter()
+            self.current[phase] += now - self.last
+            self.last = now
+
+    def end_frame(self):
+        if not self.active:
+            return
+        index = self.index
+        total = 0.0
+        for phase, seconds in self.current.items():
+            self.samples[phase][index] = seconds * 1000
+            total += seconds
+        self.totals[index] = total * 1000
+        self.index = (index + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+    def recent(self, values):
+        # Oldest first, only the part of the ring that has been written
+        if self.count < self.window:
+            return values[:self.count]
+        return values[self.index:] + values[:self.index]
+
+    def stats(self):
+        """Rolling p50/p95/p99 in milliseconds for every phase and the whole frame"""
+        rows = {}
+        for phase, values in (*self.samples.items(), ('frame', self.totals)):
+            ordered = sorted(self.recent(values))
+            rows[phase] = (percentile(ordered, 0.5), percentile(ordered, 0.95), percentile(ordered, 0.99))
+        return rows
+
+class ProfilerOverlay:
+    """Percentile table plus a frame-time graph, the table is only rebuilt every few frames"""
+
+    def __init__(self, profiler, refresh=PROFILER_REFRESH):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.font = get_font(FONT, scale_font(16, DISPLAY_SIZE))
+        self.lines = [HudText(self.font, (255, 255, 255)) for _ in range(len(PHASES) + 2)]
+        self.texts = []
+        self.frames = 0
+
+        line_height = self.font.get_linesize()
+        self.table_height = line_height * len(self.lines)
+        self.width = self.font.size('player_render  00.00  00.00  00.00')[0] + 20
+        self.graph_height = line_height * 4
+        self.panel = pygame.Surface((self.width, self.table_height + self.graph_height + 30))
+        self.panel.set_alpha(180)
+
+    def update_texts(self):
+        rows = self.profiler.stats()
+        self.texts = [f"{'ms':<13} {'p50':>6} {'p95':>6} {'p99':>6}"]
+        self.texts += [f'{phase:<13} {p50:6.2f} {p95:6.2f} {p99:6.2f}' for phase, (p50, p95, p99) in rows.items()]
+
+    def draw(self, surface, pos=(10, 140)):
+        if self.frames % self.refresh == 0:
+            self.update_texts()
+        self.frames += 1
+
+        x, y = pos
+        surface.blit(self.panel, pos)
+        line_height = self.font.get_linesize()
+        for line, text in zip(self.lines, self.texts):
+            line.draw(surface, text, (x + 10, y + 10))
+            y += line_height
+
+        # Frame work time, the yellow line is the budget at the target frame rate
+        graph = pygame.Rect(x + 10, y + 20, self.width - 20, self.graph_height)
+        budget = 1000 / FPS
+        top = budget * 2
+        budget_y = graph.bottom - int(graph.height * budget / top)
+        pygame.draw.line(surface, (255, 255, 0), (graph.left, budget_y), (graph.right, budget_y))
+
+        totals = self.profiler.recent(self.profiler.totals)
+        if len(totals) > 1:
+            step = graph.width / (self.profiler.window - 1)
+            points = [(graph.left + i * step, graph.bottom - graph.height * min(ms, top) / top) for i, ms in enumerate(totals)]
+            pygame.draw.lines(surface, (0, 255, 120), False, points)
+
+class ProfileCapture:
+    """Runs cProfile over the next N frames and writes the result next to a readable report
+
+    start() can be called from anywhere (a hotkey, a CLI flag), the engine calls
+    end_frame() once per frame with a callable that describes the current session.
+    """
+
+    def __init__(self, directory=PROFILE_DIR):
+        self.directory = directory
+        self.profile = None
+        self.frames_left = 0
+        self.frames = 0
+        self.trace_memory = False
+        self.trace_memory_default = PROFILE_TRACEMALLOC
+        self.started_tracing = False
+        self.snapshot = None
+        self.started = 0.0
+
+    @property
+    def running(self):
+        return self.profile is not None
+
+    def start(self, frames=PROFILE_FRAMES, trace_memory=None):
+        if self.running:
+            return
+        self.frames = self.frames_left = frames
+        self.trace_memory = self.trace_memory_default if trace_memory is None else trace_memory
+        if self.trace_memory:
+            self.started_tracing = not tracemalloc.is_tracing()
+            if self.started_tracing:
+                tracemalloc.start(10)
+            self.snapshot = tracemalloc.take_snapshot()
+
+        print(f'Profiling the next {frames} frames')
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def end_frame(self, context):
+        if not self.running:
+            return
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.finish(context())
+
+    def finish(self, context):
+        self.profile.disable()
+        elapsed = time.perf_counter() - self.started
+        profile, self.profile = self.profile, None
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, datetime.now().strftime('profile-%Y%m%d-%H%M%S'))
+        profile.dump_stats(base + '.prof')
+
+        info = {'frames': self.frames, 'seconds': round(elapsed, 3), 'ms_per_frame': round(elapsed * 1000 / self.frames, 3)}
+        info.update(context)
+
+        stats_text = io.StringIO()
+        pstats.Stats(profile, stream=stats_text).sort_stats('cumulative').print_stats(60)
+        with open(base + '.txt', 'w') as f:
+            f.write(json.dumps(info, indent=2, default=str) + '\n\n')
+            f.write(stats_text.getvalue())
+            if self.trace_memory:
+                f.write('\nAllocation growth during the capture:\n')
+                for diff in tracemalloc.take_snapshot().compare_to(self.snapshot, 'lineno')[:30]:
+                    f.write(f'{diff}\n')
+
+        if self.trace_memory:
+            self.snapshot = None
+            if self.started_tracing:
+                tracemalloc.stop()
+        print(f'Profile written to {base}.prof and {base}.txt')
+
+profiler = FrameProfiler()
+capture = ProfileCapture()
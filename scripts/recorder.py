@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+import numpy as np
+from scripts.aiagent import ACTION_KEYS, FEATURE_SIZE, state_features
+from scripts.events import EVENT_TYPES
+from scripts.constants import DEMO_CHUNK_FRAMES
+
+INDEX_FILE = 'index.json'
+
+class DemoRecorder:
+    """Collects (observation, action, frame, events) rows and writes them as .npy shards off the main thread"""
+
+    def __init__(self, directory, physics, chunk_size=DEMO_CHUNK_FRAMES):
+        self.physics = physics
+        self.chunk_size = chunk_size
+        # The pid keeps parallel workers apart, the counter covers restarts within the same second
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        os.makedirs(directory, exist_ok=True)
+        attempt = 0
+        while True:
+            self.session_dir = os.path.join(directory, stamp if attempt == 0 else f'{stamp}-{attempt}')
+            try:
+                os.makedirs(self.session_dir)
+                break
+            except FileExistsError:
+                attempt += 1
+
+        self.observations = []
+        self.actions = []
+        self.frames = []
+        self.events = []
+        self.shard_count = 0
+        self.closed = False
+
+        self._queue = queue.Queue()
+        self._index = {'feature_size': FEATURE_SIZE, 'action_keys': list(ACTION_KEYS), 'event_types': list(EVENT_TYPES), 'shards': []}
+        self._thread = threading.Thread(target=self._writer, name='demo-writer', daemon=True)
+        self._thread.start()
+        # The game quits through sys.exit, make sure the last partial shard still lands on disk
+        atexit.register(self.close)
+
+    def record(self, state, keys, frame, events=0):
+        self.observations.append(state_features(state, self.physics))
+        self.actions.append([keys[key] for key in ACTION_KEYS])
+        self.frames.append(frame)
+        self.events.append(events)
+        if len(self.frames) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.frames:
+            return
+        # Hand the python lists to the writer as-is; array conversion happens on its thread
+        self._queue.put((self.shard_count, self.observations, self.actions, self.frames, self.events))
+        self.shard_count += 1
+        self.observations = []
+        self.actions = []
+        self.frames = []
+        self.events = []
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Drop the exit hook so a closed recorder is not kept alive until the process ends
+        atexit.unregister(self.close)
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _writer(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+
+            shard_id, observations, actions, frames, events = chunk
+            name = f'{shard_id:05d}'
+            np.save(os.path.join(self.session_dir, f'obs_{name}.npy'), np.asarray(observations, dtype=np.float32))
+            np.save(os.path.join(self.session_dir, f'act_{name}.npy'), np.asarray(actions, dtype=np.uint8))
+            np.save(os.path.join(self.session_dir, f'frame_{name}.npy'), np.asarray(frames, dtype=np.int32))
+            np.save(os.path.join(self.session_dir, f'events_{name}.npy'), np.asarray(events, dtype=np.uint8))
+
+            self._index['shards'].append({'name': name, 'rows': len(frames)})
+            index_path = os.path.join(self.session_dir, INDEX_FILE)
+            with open(index_path + '.tmp', 'w') as f:
+                json.dump(self._index, f, indent=4)
+            os.replace(index_path + '.tmp', index_path)
+
+class DemoDataset:
+    """Memory-mapped view over every recording session found below a directory"""
+
+    def __init__(self, directory):
+        self.shards = []
+        for root, _, files in sorted(os.walk(directory)):
+            if INDEX_FILE not in files:
+                continue
+            with open(os.path.join(root, INDEX_FILE), 'r') as f:
+                index = json.load(f)
+            for shard in index['shards']:
+                frames = np.load(os.path.join(root, f"frame_{shard['name']}.npy"), mmap_mode='r')
+                # Sessions recorded before events were tracked have no events shard
+                events_path = os.path.join(root, f"events_{shard['name']}.npy")
+                events = np.load(events_path, mmap_mode='r') if os.path.exists(events_path) else np.zeros(len(frames), np.uint8)
+                self.shards.append((
+                    np.load(os.path.join(root, f"obs_{shard['name']}.npy"), mmap_mode='r'),
+                    np.load(os.path.join(root, f"act_{shard['name']}.npy"), mmap_mode='r'),
+                    frames,
+                    events,
+                ))
+
+    def __len__(self):
+        return sum(len(frames) for _, _, frames, _ in self.shards)
+
+    def __iter__(self):
+        return iter(self.shards)
+
+    def load(self):
+        if not self.shards:
+            return (np.empty((0, FEATURE_SIZE), np.float32), np.empty((0, len(ACTION_KEYS)), np.uint8),
+                    np.empty(0, np.int32), np.empty(0, np.uint8))
+        observations, actions, frames, events = zip(*self.shards)
+        return np.concatenate(observations), np.concatenate(actions), np.concatenate(frames), np.concatenate(events)
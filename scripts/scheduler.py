@@ -0,0 +1,36 @@
+import pygame
+from scripts.constants import FPS, IDLE_FPS, IDLE_AFTER_FRAMES
+
+class FrameScheduler:
+    """Paces the engine loop: full rate while something changes, idle rate once a state goes quiet
+
+    A state opts in to throttling with an is_idle() method. While idle the loop sleeps in
+    pygame.event.wait, so any input wakes it immediately and the next frame runs at full rate.
+    """
+
+    def __init__(self, clock, fps=FPS, idle_fps=IDLE_FPS, idle_after=IDLE_AFTER_FRAMES):
+        self.clock = clock
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.quiet_frames = 0
+        self.dt = 1.0 / fps
+
+    @property
+    def idle(self):
+        return self.quiet_frames >= self.idle_after
+
+    def end_frame(self, state):
+        is_idle = getattr(state, 'is_idle', None)
+        self.quiet_frames = self.quiet_frames + 1 if is_idle and is_idle() else 0
+
+        if self.idle:
+            event = pygame.event.wait(1000 // self.idle_fps)
+            if event.type != pygame.NOEVENT:
+                # Hand the wake-up event back so the state still sees it next frame
+                pygame.event.post(event)
+                self.quiet_frames = 0
+            self.dt = self.clock.tick() / 1000.0
+        else:
+            self.dt = self.clock.tick(self.fps) / 1000.0
+        return self.dt
@@ -0,0 +1,78 @@
+import time
+import random
+from scripts.constants import TILE_SIZE, PLAYER_BUFFER
+from scripts.player import Player
+from scripts.tilemap import Tilemap, map_cache
+from scripts.physics import create_physics
+from scripts.utils import Animation, AnimationClock
+from scripts.events import EventBuffer
+from scripts.telemetry import telemetry
+
+PLAYER_ACTIONS = [
+    'idle', 'run', 'finish', 'death', 'wallslide', 'wallcollide',
+    'jump_anticipation', 'jump_rising', 'jump_peak', 'jump_falling', 'jump_landing', 'jump_land',
+]
+
+def headless_assets():
+    # Player.set_action only needs something with the Animation interface
+    return {'player/' + action: Animation([None]) for action in PLAYER_ACTIONS}
+
+class Simulation:
+    """Display-free stand-in for Environment that only steps the player physics"""
+
+    def __init__(self, map_path, tile_size=TILE_SIZE, seed=0, physics=None):
+        self.physics = physics or create_physics(tile_size)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.assets = headless_assets()
+        self.events = EventBuffer()
+        self.animation_clock = AnimationClock()
+        self.tilemap = Tilemap(self, tile_size=tile_size, physics_size=self.physics.tile_units)
+        self.player = None
+        telemetry.open_default(source='simulation', physics=self.physics.name)
+        self.load_map(map_path)
+
+    def load_map(self, map_path):
+        started = time.perf_counter()
+        self.map_path = map_path
+        compiled = map_cache.get(map_path, self.tilemap.physics_size)
+        self.tilemap.load_compiled(compiled)
+        self.default_pos = self.physics.to_units(compiled['spawn'])
+
+        if self.player is None:
+            self.player = Player(self, self.default_pos.copy(), self.physics.player_size)
+        self.reset()
+        telemetry.map_loaded(map_path, time.perf_counter() - started)
+
+    def reset(self):
+        self.player.reset()
+        self.player.pos = self.default_pos.copy()
+        self.buffer_times = {'jump': 0}
+        self.frame = 0
+
+    def step(self, keys):
+        # Mirrors Environment.set_action followed by the player part of Environment.update
+        self.buffer_times['jump'] = min(self.buffer_times['jump'] + 1, PLAYER_BUFFER + 1) if keys['jump'] else 0
+        self.events.clear()
+        self.animation_clock.advance()
+        self.player.update(self.tilemap, keys, 0)
+        self.frame += 1
+        telemetry.step()
+        return self.player.finishLevel, self.player.death
+
+    def snapshot(self):
+        return (self.player.snapshot(), self.buffer_times['jump'], self.frame)
+
+    def restore(self, snapshot):
+        player_state, jump_buffer, frame = snapshot
+        self.player.restore(player_state)
+        self.buffer_times['jump'] = jump_buffer
+        self.frame = frame
+
+    def finish_centers(self):
+        centers = []
+        size = self.tilemap.physics_size
+        for tile in self.tilemap.tilemap.values():
+            if tile['type'] in ('finish', 'finish up'):
+                centers.append((tile['pos'][0] * size + size / 2, tile['pos'][1] * size + size))
+        return centers
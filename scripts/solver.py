@@ -0,0 +1,136 @@
+import os
+import json
+import math
+import argparse
+from multiprocessing import Pool
+from scripts.constants import FPS, COYOTE_TIME, PLAYER_BUFFER, PHYSICS_REFERENCE_TILE
+from scripts.simulation import Simulation
+from scripts.telemetry import telemetry
+
+# Every distinct input a player can hold for one frame
+ACTIONS = [
+    {'left': False, 'right': False, 'jump': False},
+    {'left': True, 'right': False, 'jump': False},
+    {'left': False, 'right': True, 'jump': False},
+    {'left': False, 'right': False, 'jump': True},
+    {'left': True, 'right': False, 'jump': True},
+    {'left': False, 'right': True, 'jump': True},
+]
+
+POSITION_BUCKETS = 8 # position buckets per tile used for state deduplication
+VELOCITY_BUCKET = 0.25 # velocity bucket size in pixels per frame at the reference tile size
+
+def state_key(sim):
+    player = sim.player
+    position_bucket = sim.physics.tile_units / POSITION_BUCKETS
+    velocity_bucket = VELOCITY_BUCKET * sim.physics.tile_units / PHYSICS_REFERENCE_TILE
+    return (
+        int(player.pos[0] // position_bucket),
+        int(player.pos[1] // position_bucket),
+        round(player.velocity[0] / velocity_bucket),
+        round(player.velocity[1] / velocity_bucket),
+        player.jump_phase,
+        min(player.coyote_time, COYOTE_TIME + 1),
+        player.jump_available,
+        player.grounded,
+        min(sim.buffer_times['jump'], PLAYER_BUFFER + 1),
+    )
+
+def goal_heuristic(sim, goals):
+    # Optimistic frames left: straight-line distance at top horizontal speed
+    rect = sim.player.rect()
+    return min(math.dist(rect.center, goal) for goal in goals) / sim.physics.max_x_speed
+
+def solve_map(map_path, beam_width=512, max_frames=FPS * 120):
+    sim = Simulation(map_path)
+    goals = sim.finish_centers()
+    if not goals:
+        return {'map': map_path, 'solved': False, 'reason': 'map has no finish tile'}
+
+    seen = {state_key(sim)}
+    beam = [(goal_heuristic(sim, goals), sim.snapshot(), None)]
+    explored = 0
+
+    for frame in range(1, max_frames + 1):
+        candidates = []
+        for _, snapshot, history in beam:
+            for action_index, action in enumerate(ACTIONS):
+                sim.restore(snapshot)
+                finished, dead = sim.step(action)
+                explored += 1
+                if dead:
+                    continue
+
+                node_history = (action_index, history)
+                if finished:
+                    return _solution(map_path, frame, node_history, explored)
+
+                key = state_key(sim)
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidates.append((goal_heuristic(sim, goals), sim.snapshot(), node_history))
+
+        if not candidates:
+            break
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        beam = candidates[:beam_width]
+
+    return {'map': map_path, 'solved': False, 'reason': f'no finish reached within {max_frames} frames', 'explored': explored}
+
+def _solution(map_path, frames, history, explored):
+    inputs = []
+    while history is not None:
+        action_index, history = history
+        action = ACTIONS[action_index]
+        inputs.append([int(action['left']), int(action['right']), int(action['jump'])])
+    inputs.reverse()
+
+    return {
+        'map': map_path,
+        'solved': True,
+        'frames': frames,
+        'time': frames / FPS,
+        'explored': explored,
+        'inputs': inputs, # [left, right, jump] per frame
+    }
+
+def _solve_job(job):
+    try:
+        return solve_map(*job)
+    finally:
+        telemetry.sync()
+
+def solve_maps(map_paths, beam_width=512, max_frames=FPS * 120, workers=None):
+    jobs = [(path, beam_width, max_frames) for path in map_paths]
+    with Pool(processes=workers) as pool:
+        return pool.map(_solve_job, jobs)
+
+def main():
+    parser = argparse.ArgumentParser(description='Search for the fastest input sequence on each map')
+    parser.add_argument('maps', nargs='*', help='map files to solve (default: every map in data/maps)')
+    parser.add_argument('--beam', type=int, default=512, help='states kept per frame')
+    parser.add_argument('--max-frames', type=int, default=FPS * 120)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='data/solutions')
+    args = parser.parse_args()
+
+    map_paths = args.maps or sorted(
+        (os.path.join('data', 'maps', f) for f in os.listdir(os.path.join('data', 'maps')) if f.endswith('.json')),
+        key=lambda path: int(os.path.basename(path).split('.')[0])
+    )
+
+    os.makedirs(args.out, exist_ok=True)
+    for result in solve_maps(map_paths, args.beam, args.max_frames, args.workers):
+        out_path = os.path.join(args.out, os.path.basename(result['map']))
+        with open(out_path, 'w') as f:
+            json.dump(result, f)
+
+        if result['solved']:
+            print(f"{result['map']}: {result['frames']} frames ({result['time']:.3f}s) -> {out_path}")
+        else:
+            print(f"{result['map']}: unsolved ({result['reason']})")
+
+if __name__ == '__main__':
+    main()
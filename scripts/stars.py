@@ -1,73 +1,105 @@
-import random
-from scripts.utils import Animation
-from scripts.constants import BASE_IMG_DUR
 import math
-
-
+import random
 import pygame
+from scripts.constants import BASE_IMG_DUR
 
-class StarAnimated:
-    def __init__(self, pos, anim: Animation, depth, anim_offset=0, scale=1.0):
-        self.pos = pos
-        self.anim = anim.copy()
-        self.anim.frame = anim_offset
-        self.depth = depth
-        self.scale = scale
-        self._scaled_image_cache = None
-        self._last_frame = -1
-
-    def update(self, dt=1.0):
-        self.anim.update(dt)
-
-    def render(self, surf, offset=(0, 0)):
-        render_pos = (
-            self.pos[0] - offset[0] * self.depth,
-            self.pos[1] - offset[1] * self.depth
-        )
-        img = self.anim.img()
-
-        # Cache scaled image to avoid rescaling every frame if not changed
-        if self._last_frame != int(self.anim.frame) or self._scaled_image_cache is None:
-            size = (int(img.get_width() * self.scale), int(img.get_height() * self.scale))
-            self._scaled_image_cache = pygame.transform.smoothscale(img, size)
-            self._last_frame = int(self.anim.frame)
-
-        scaled_img = self._scaled_image_cache
-
-        x = render_pos[0] % (surf.get_width() + scaled_img.get_width()) - scaled_img.get_width()
-        y = render_pos[1] % (surf.get_height() + scaled_img.get_height()) - scaled_img.get_height()
-
-        surf.blit(scaled_img, (x, y))
+SCALE_RANGE = (0.5, 1.5)
+SCALE_BUCKETS = 8 # star sizes are snapped to this many pre-scaled frame sets
+
+def poisson_disk(size, min_dist, rng, attempts=30):
+    """Bridson sampling: a background grid keeps every neighbour check to a constant number of cells"""
+    width, height = size
+    cell = min_dist / math.sqrt(2)
+    cols, rows = int(width / cell) + 1, int(height / cell) + 1
+    grid = [None] * (cols * rows)
+    points = []
+    active = []
+    min_dist_sq = min_dist * min_dist
+
+    def fits(x, y):
+        gx, gy = int(x / cell), int(y / cell)
+        for row in range(max(gy - 2, 0), min(gy + 3, rows)):
+            for col in range(max(gx - 2, 0), min(gx + 3, cols)):
+                other = grid[row * cols + col]
+                if other is not None and (other[0] - x) ** 2 + (other[1] - y) ** 2 < min_dist_sq:
+                    return False
+        return True
+
+    def add(x, y):
+        points.append((x, y))
+        active.append((x, y))
+        grid[int(y / cell) * cols + int(x / cell)] = (x, y)
+
+    add(rng.random() * width, rng.random() * height)
+    while active:
+        index = rng.randrange(len(active))
+        origin_x, origin_y = active[index]
+        for _ in range(attempts):
+            angle = rng.random() * math.tau
+            radius = min_dist * (1 + rng.random())
+            x = origin_x + math.cos(angle) * radius
+            y = origin_y + math.sin(angle) * radius
+            if 0 <= x < width and 0 <= y < height and fits(x, y):
+                add(x, y)
+                break
+        else:
+            active[index] = active[-1]
+            active.pop()
+    return points
 
 class StarsAnimated:
-    def __init__(self, base_images, display_size, count=200, min_dist=30):
-        self.stars = []
-        positions = []
+    """Parallax starfield where every star shares pre-scaled frames and the animation clock
+
+    Stars live on a field one sprite larger than the display and wrap around it, so
+    the whole layer is drawn with a single Surface.blits call per frame. Frames come
+    from the clock's tick plus each star's phase, nothing is advanced per star.
+    """
+
+    def __init__(self, base_images, display_size, clock, count=200, min_dist=30, rng=None):
+        rng = rng or random.Random()
+        self.clock = clock
+
+        low, high = SCALE_RANGE
+        bucket_size = (high - low) / SCALE_BUCKETS
+        self.frame_sets = []
+        for bucket in range(SCALE_BUCKETS):
+            scale = low + (bucket + 0.5) * bucket_size
+            self.frame_sets.append([
+                pygame.transform.smoothscale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
+                for img in base_images
+            ])
+
+        largest = self.frame_sets[-1]
+        self.pad = (max(img.get_width() for img in largest), max(img.get_height() for img in largest))
+        self.field = (display_size[0] + self.pad[0], display_size[1] + self.pad[1])
+
+        # Shrink the spacing when the requested count would not fit at min_dist
+        area = self.field[0] * self.field[1]
+        spacing = min(min_dist, 0.75 * math.sqrt(area / max(count, 1)))
+        positions = poisson_disk(self.field, spacing, rng)
+        if len(positions) > count:
+            positions = rng.sample(positions, count)
 
-        BASE_IMG_DUR = 20  # base duration for slower animation
-
-        for _ in range(count):
-            # Find a non-overlapping position
-            while True:
-                pos = (random.random() * 99999, random.random() * 99999)
-                if all(math.dist(pos, p) >= min_dist for p in positions):
-                    positions.append(pos)
-                    break
-            
-            depth = random.uniform(0.4, 1.0)
-            img_dur = BASE_IMG_DUR + random.randint(0, 5)
-            anim = Animation(base_images, img_dur=img_dur, loop=True)
-            anim_offset = random.uniform(0, img_dur * len(base_images))
-            scale = random.uniform(0.5, 1.5)
-
-            self.stars.append(StarAnimated(pos, anim, depth, anim_offset, scale))
-
-        self.stars.sort(key=lambda star: star.depth)
+        self.stars = []
+        for x, y in positions:
+            depth = rng.uniform(0.4, 1.0)
+            img_dur = BASE_IMG_DUR + rng.randint(0, 5)
+            phase = rng.uniform(0, img_dur * len(base_images))
+            bucket = min(int((rng.uniform(low, high) - low) / bucket_size), SCALE_BUCKETS - 1)
+            self.stars.append((x, y, depth, img_dur, phase, self.frame_sets[bucket]))
 
-    def update(self, dt=1.0):
-        for star in self.stars:
-            star.update(dt)
+        self.stars.sort(key=lambda star: star[2])
 
     def render(self, surf, offset=(0, 0)):
-        for star in self.stars:
-            star.render(surf, offset=offset)
\ No newline at end of file
+        tick = self.clock.tick
+        field_w, field_h = self.field
+        pad_w, pad_h = self.pad
+        offset_x, offset_y = offset
+
+        blits = []
+        for x, y, depth, img_dur, phase, frames in self.stars:
+            img = frames[int((tick + phase) / img_dur) % len(frames)]
+            blits.append((img, ((x - offset_x * depth) % field_w - pad_w, (y - offset_y * depth) % field_h - pad_h)))
+
+        # Stars wrapped into the padding strip are clipped by blits itself
+        surf.blits(blits, doreturn=False)
@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+import json
+import queue
+import atexit
+import threading
+from array import array
+from scripts.constants import TELEMETRY_PATH, TELEMETRY_INTERVAL, TELEMETRY_WINDOW
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def rss_bytes():
+    # Current resident set on Linux, peak resident set elsewhere, None when neither is available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class JsonLinesWriter:
+    """Appends records to a file from a daemon thread, the caller never waits on disk
+
+    When the queue is full records are dropped and counted instead of blocking.
+    """
+
+    def __init__(self, path, max_pending=1024):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.pending = queue.Queue(max_pending)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._worker, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        with open(self.path, 'a') as f:
+            while True:
+                record = self.pending.get()
+                if record is None:
+                    self.pending.task_done()
+                    return
+                f.write(json.dumps(record, default=str) + '\n')
+                if self.pending.empty():
+                    f.flush()
+                self.pending.task_done()
+
+    def write(self, record):
+        try:
+            self.pending.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def drain(self):
+        # Returns once everything queued so far is written and flushed
+        self.pending.join()
+
+    def close(self):
+        self.pending.put(None)
+        self._thread.join(timeout=2)
+
+class Telemetry:
+    """Periodic performance records for unattended machines, off unless open() is called
+
+    The engine reports every frame, simulations report every step; both also flush a
+    record once TELEMETRY_INTERVAL seconds have passed.
+    """
+
+    def __init__(self, interval=TELEMETRY_INTERVAL, window=TELEMETRY_WINDOW):
+        self.interval = interval
+        self.window = window
+        self.writer = None
+        self.pid = None
+        self.sources = {}
+        self.reset()
+
+    @property
+    def enabled(self):
+        return self.writer is not None
+
+    def reset(self):
+        self.frame_ms = array('d')
+        self.steps = 0
+        self.map_loads = []
+        self.period_start = time.perf_counter()
+
+    def open(self, path, **session):
+        # A forked worker inherits the writer but not its thread, so it opens its own
+        if self.writer is not None and self.pid == os.getpid():
+            return
+        self.pid = os.getpid()
+        self.writer = JsonLinesWriter(path.format(pid=self.pid))
+        self.started = time.perf_counter()
+        self.writer.write({'kind': 'session', 'time': time.time(), 'pid': self.pid, **session})
+        self.reset()
+        atexit.register(self.close)
+
+    def open_default(self, **session):
+        if TELEMETRY_PATH:
+            self.open(TELEMETRY_PATH, **session)
+
+    def add_source(self, name, read):
+        """Register a callable whose result is attached to every periodic record"""
+        self.sources[name] = read
+
+    def frame(self, work):
+        """Seconds a frame spent working, excluding any time the scheduler slept"""
+        if self.writer is None:
+            return
+        # Frames past the window are left out so a long interval cannot grow the buffer
+        if len(self.frame_ms) < self.window:
+            self.frame_ms.append(work * 1000)
+        self.maybe_flush()
+
+    def step(self):
+        if self.writer is None:
+            return
+        self.steps += 1
+        if self.steps & 1023 == 0:
+            self.maybe_flush()
+
+    def map_loaded(self, path, seconds):
+        if self.writer is not None:
+            self.map_loads.append({'map': path, 'ms': round(seconds * 1000, 3)})
+
+    def maybe_flush(self):
+        if time.perf_counter() - self.period_start >= self.interval:
+            self.flush()
+
+    def flush(self):
+        now = time.perf_counter()
+        elapsed = max(now - self.period_start, 1e-9)
+        ordered = sorted(self.frame_ms)
+        record = {
+            'kind': 'perf',
+            'time': time.time(),
+            'uptime': round(now - self.started, 3),
+            'interval': round(elapsed, 3),
+            'frames': len(ordered),
+            'frame_ms': {
+                'p50': percentile(ordered, 0.5),
+                'p95': percentile(ordered, 0.95),
+                'p99': percentile(ordered, 0.99),
+                'max': ordered[-1] if ordered else 0.0,
+            },
+            'steps_per_s': round(self.steps / elapsed, 1),
+            'map_loads': self.map_loads,
+            'rss_bytes': rss_bytes(),
+            'dropped': self.writer.dropped,
+        }
+        for name, read in self.sources.items():
+            record[name] = read()
+        self.writer.write(record)
+        self.reset()
+
+    def sync(self):
+        """Write the current period and wait until it is on disk
+
+        Pool workers are ended with os._exit and never run atexit, so each task calls
+        this before handing its result back.
+        """
+        if self.writer is not None and self.pid == os.getpid():
+            self.flush()
+            self.writer.drain()
+
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+
+telemetry = Telemetry()
@@ -1,19 +1,21 @@
 # tilemap.py
+import os
 import json
 import pygame
 from scripts.constants import PHYSICS_TILES, INTERACTIVE_TILES, SPIKE_SIZE, NEIGHBOR_OFFSETS, AUTOTILE_TYPES, AUTOTILE_MAP
 
 class Tilemap:
-    def __init__(self, game, tile_size=16):
+    def __init__(self, game, tile_size=16, physics_size=None):
         self.game = game
         self.tile_size = tile_size
+        self.physics_size = physics_size or tile_size # tile size in physics units, used by collision queries
         self.tilemap = {}
         self.offgrid_tiles = []
         self.lowest_y = 0
     
     def tiles_around(self, pos):
         tiles = []
-        tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        tile_loc = (int(pos[0] // self.physics_size), int(pos[1] // self.physics_size))
         for offset in NEIGHBOR_OFFSETS:
             check_loc = str(tile_loc[0] + offset[0]) + ';' + str(tile_loc[1] + offset[1])
             if check_loc in self.tilemap:
@@ -121,32 +123,40 @@ class Tilemap:
         self.offgrid_tiles = map_data['offgrid']
         self.lowest_y = map_data.get('lowest_y', 0)
         self._handle_spawners()
+
+    def load_compiled(self, compiled):
+        # Compiled tiles are shared between tilemaps, only the containers are copied
+        self.tilemap = dict(compiled['tilemap'])
+        self.offgrid_tiles = list(compiled['offgrid'])
+        self.lowest_y = compiled['lowest_y']
     
     def physics_rects_around(self, pos):
         rects = []
         for tile in self.tiles_around(pos):
             if tile['type'].split()[0] in PHYSICS_TILES:
                 rects.append(pygame.Rect(
-                    tile['pos'][0] * self.tile_size, 
-                    tile['pos'][1] * self.tile_size, 
-                    self.tile_size, self.tile_size
+                    tile['pos'][0] * self.physics_size, 
+                    tile['pos'][1] * self.physics_size, 
+                    self.physics_size, self.physics_size
                 ))
         return rects
     
-    def _get_spike_rect(self, tile):
-        spike_w, spike_h = int(self.tile_size * SPIKE_SIZE[0]), int(self.tile_size * SPIKE_SIZE[1])
+    def _get_spike_rect(self, tile, tile_size=None):
+        tile_size = tile_size or self.physics_size
+        spike_w, spike_h = int(tile_size * SPIKE_SIZE[0]), int(tile_size * SPIKE_SIZE[1])
         rotation = tile.get('rotation', 0)
-        tile_x, tile_y = tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size
+        tile_x, tile_y = tile['pos'][0] * tile_size, tile['pos'][1] * tile_size
         
         positions = {
-            0: (tile_x + (self.tile_size - spike_w) // 2, tile_y + (self.tile_size - spike_h), spike_w, spike_h),
-            90: (tile_x + (self.tile_size - spike_h), tile_y + (self.tile_size - spike_w) // 2, spike_h, spike_w),
-            180: (tile_x + (self.tile_size - spike_w) // 2, tile_y, spike_w, spike_h),
-            270: (tile_x, tile_y + (self.tile_size - spike_w) // 2, spike_h, spike_w)
+            0: (tile_x + (tile_size - spike_w) // 2, tile_y + (tile_size - spike_h), spike_w, spike_h),
+            90: (tile_x + (tile_size - spike_h), tile_y + (tile_size - spike_w) // 2, spike_h, spike_w),
+            180: (tile_x + (tile_size - spike_w) // 2, tile_y, spike_w, spike_h),
+            270: (tile_x, tile_y + (tile_size - spike_w) // 2, spike_h, spike_w)
         }
         return pygame.Rect(*positions.get(rotation, positions[0]))
 
     def interactive_rects_around(self, pos):
+        size = self.physics_size
         tiles = []
         for tile in self.tiles_around(pos):
             base_type = tile['type'].split()[0]
@@ -156,36 +166,36 @@ class Tilemap:
             match base_type:
                 case 'finish':
                     if tile['type'] in ['finish up', 'finish']:
-                        rect = pygame.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, 
-                                         self.tile_size, self.tile_size * 2)
+                        rect = pygame.Rect(tile['pos'][0] * size, tile['pos'][1] * size, 
+                                         size, size * 2)
                         tiles.append((rect, (base_type, tile['variant'])))
                     elif tile['type'] == 'finish down':
                         # Only add if no corresponding 'up' tile exists
                         up_loc = f"{tile['pos'][0]};{tile['pos'][1] - 1}"
                         if up_loc not in self.tilemap or self.tilemap[up_loc]['type'] != 'finish up':
-                            rect = pygame.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, 
-                                             self.tile_size, self.tile_size)
+                            rect = pygame.Rect(tile['pos'][0] * size, tile['pos'][1] * size, 
+                                             size, size)
                             tiles.append((rect, (base_type, tile['variant'])))
                 case 'spikes':
                     tiles.append((self._get_spike_rect(tile), (base_type, tile['variant'])))
                 case 'kill':
-                    rect = pygame.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, 
-                                     self.tile_size, self.tile_size)
+                    rect = pygame.Rect(tile['pos'][0] * size, tile['pos'][1] * size, 
+                                     size, size)
                     tiles.append((rect, (base_type, tile['variant'])))
         return tiles
     
     def is_below_map(self, entity_pos, tiles_threshold=2):
-        return entity_pos[1] > (self.lowest_y + tiles_threshold) * self.tile_size
+        return entity_pos[1] > (self.lowest_y + tiles_threshold) * self.physics_size
 
     def _get_image(self, tile_type, variant):
         asset = self.game.assets[tile_type]
-        return asset.img() if hasattr(asset, 'img') else asset[variant]
+        return asset.img(self.game.animation_clock.tick) if hasattr(asset, 'img') else asset[variant]
 
     def render(self, surf, offset=(0, 0), zoom=10):
         # Render offgrid tiles
         for tile in self.offgrid_tiles:
             if tile['type'] == 'spikes' and 'rotation' in tile:
-                img = self.game.get_rotated_image(tile['type'], tile['variant'], tile['rotation'])
+                img = self.game.sprite_variants.rotated(tile['type'], tile['variant'], tile['rotation'])
                 x = tile['pos'][0] * self.tile_size - offset[0] - (img.get_width() - self.tile_size) // 2
                 y = tile['pos'][1] * self.tile_size - offset[1] - (img.get_height() - self.tile_size) // 2
             else:
@@ -204,7 +214,7 @@ class Tilemap:
             y_pos = tile['pos'][1] * self.tile_size - offset[1]
             
             if base_type == 'spikes' and 'rotation' in tile:
-                img = self.game.get_rotated_image(base_type, tile['variant'], tile['rotation'])
+                img = self.game.sprite_variants.rotated(base_type, tile['variant'], tile['rotation'])
                 x_pos -= (img.get_width() - self.tile_size) // 2
                 y_pos -= (img.get_height() - self.tile_size) // 2
             elif base_type == 'finish':
@@ -214,4 +224,36 @@ class Tilemap:
             else:
                 img = self._get_image(base_type, tile['variant'])
             
-            surf.blit(img, (x_pos, y_pos))
\ No newline at end of file
+            surf.blit(img, (x_pos, y_pos))
+
+class MapCache:
+    def __init__(self):
+        self.maps = {}
+
+    def get(self, path, tile_size):
+        # Maps are keyed by tile size since the spawn position is stored in (physics) pixels,
+        # and recompiled whenever the editor rewrites the file
+        key = (os.path.normpath(path), tile_size)
+        mtime = os.path.getmtime(path)
+        entry = self.maps.get(key)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, self._compile(path, tile_size))
+            self.maps[key] = entry
+        return entry[1]
+
+    def preload(self, paths, tile_size):
+        for path in paths:
+            self.get(path, tile_size)
+
+    def _compile(self, path, tile_size):
+        tilemap = Tilemap(None, tile_size=tile_size)
+        tilemap.load(path)
+        spawners = tilemap.extract([('spawners', 0), ('spawners', 1)])
+        return {
+            'tilemap': tilemap.tilemap,
+            'offgrid': tilemap.offgrid_tiles,
+            'lowest_y': tilemap.lowest_y,
+            'spawn': spawners[0]['pos'].copy() if spawners else [10, 10],
+        }
+
+map_cache = MapCache()
@@ -1,31 +1,18 @@
 import os
 import pygame
 from scripts.constants import *
+from scripts.assets import asset_registry, load_sounds, BASE_IMG_PATH
+from scripts.hud import get_font, hud_text
 
-BASE_IMG_PATH = 'data/images/'
+DEBUG_LABEL_POS = (10, 150) # where draw_debug_info puts its status line, in world pixels
+DEBUG_LABEL_SIZE = 20
 
 def load_image(path, scale = None, remove_color = (0, 0, 0)):
-    img = pygame.image.load(BASE_IMG_PATH + path).convert()
-    if remove_color is not None: img.set_colorkey(remove_color)
-    if scale is not None:
-        img = pygame.transform.scale(img, scale)
-    return img
-
-def load_sounds(path, volume=0.05):  
-    sounds = []
-    full_path = 'data/sfx/' + path
-    for snd_name in sorted(os.listdir(full_path)):
-        if snd_name.endswith('.mp3'):
-            sound = pygame.mixer.Sound(os.path.join(full_path, snd_name))
-            sound.set_volume(volume)  # Set the volume here
-            sounds.append(sound)
-    return sounds
+    # Surfaces are shared through the registry, copy before modifying them
+    return asset_registry.image(path, scale, remove_color)
 
 def load_images(path, scale = None, remove_color = (0, 0, 0)):
-    images = []
-    for img_name in sorted(os.listdir(BASE_IMG_PATH + path)):
-        images.append(load_image(path + '/' + img_name, scale, remove_color))
-    return images
+    return asset_registry.images(path, scale, remove_color)
 
 def find_next_numeric_filename(directory, extension='.json'):
     existing_files = os.listdir(directory)
@@ -74,7 +61,7 @@ def scale_font(base_size, display_size, reference_size=(1920, 1080)):
 
 def draw_debug_info(game, surface, offset):
     # Draw player rect
-    player_rect = game.player.rect()
+    player_rect = game.player.render_rect()
     pygame.draw.rect(
         surface, 
         (255, 0, 0),  
@@ -102,7 +89,7 @@ def draw_debug_info(game, surface, offset):
                     if base_type == 'spikes':
                         color = (255, 255, 0)  # Yellow for spikes
                         if 'rotation' in tile:
-                            rect = game.tilemap._get_spike_rect(tile)
+                            rect = game.tilemap._get_spike_rect(tile, game.tilemap.tile_size)
                         else:
                             rect = pygame.Rect(tile['pos'][0] * game.tilemap.tile_size, 
                                              tile['pos'][1] * game.tilemap.tile_size, 
@@ -138,13 +125,11 @@ def draw_debug_info(game, surface, offset):
                         )
     
     # Show debug status
-    debug_font = pygame.font.Font(FONT, 20)
-    debug_text = debug_font.render("Debug: Hitboxes Visible", True, (0, 255, 0))
-    surface.blit(debug_text, (10, 150))
+    hud_text(get_font(FONT, DEBUG_LABEL_SIZE), (0, 255, 0)).draw(surface, "Debug: Hitboxes Visible", DEBUG_LABEL_POS)
 
 def update_camera_smooth(player, scroll, display_width, display_height):
     """Simple camera with light smoothing"""
-    player_rect = player.rect()
+    player_rect = player.render_rect()
     
     # Target position (centered on player)
     target_x = player_rect.centerx - display_width // 2
@@ -155,27 +140,39 @@ def update_camera_smooth(player, scroll, display_width, display_height):
     scroll[1] += (target_y - scroll[1]) / 8
     
     return scroll
+class AnimationClock:
+    """Frame counter every animation reads from, advanced once per simulated frame"""
+
+    def __init__(self):
+        self.tick = 0
+
+    def advance(self, frames=1):
+        self.tick += frames
+
+animation_clock = AnimationClock()
+
 class Animation:
+    """Immutable clip shared by all users; callers pass how many ticks passed since it started"""
+
     def __init__(self, images, img_dur=5, loop=True):
         self.images = images
         self.loop = loop
         self.img_duration = img_dur
-        self.done = False
-        self.frame = 0
-    
-    def copy(self):
-        return Animation(self.images, self.img_duration, self.loop)
+        self.length = img_dur * len(images)
     
-    def update(self, dt=1.0):
+    def frame(self, elapsed):
         if self.loop:
-            self.frame = (self.frame + dt) % (self.img_duration * len(self.images))
-        else:
-            self.frame = min(self.frame + dt, self.img_duration * len(self.images) - 1)
-            if self.frame >= self.img_duration * len(self.images) - 1:
-                self.done = True
+            return elapsed % self.length
+        return min(elapsed, self.length - 1)
     
-    def img(self):
-        return self.images[int(self.frame / self.img_duration)]
+    def done(self, elapsed):
+        return not self.loop and elapsed >= self.length - 1
+    
+    def index(self, elapsed):
+        return int(self.frame(elapsed) / self.img_duration)
+    
+    def img(self, elapsed=0):
+        return self.images[self.index(elapsed)]
 
 class Button:
     def __init__(self, rect, text, action, font, menu, bg_color=None):
@@ -193,21 +190,36 @@ class Button:
         # Calculate shadow offset based on display size
         display_height = pygame.display.get_surface().get_height()
         self.shadow_offset = max(2, int(4 * (display_height / 1080)))
+        self._layers = {}
     
     def is_hovered(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)
     
     def draw(self, surface):
+        # Composed layers are kept per hover state and rebuilt only when text, size or colour change
+        display_size = pygame.display.get_surface().get_size()
+        key = (self.text, tuple(self.rect), self.bg_color, display_size)
+        cached = self._layers.get(self.selected)
+        if cached is None or cached[0] != key:
+            cached = self._layers[self.selected] = (key, *self._build_layer(self.selected, display_size))
+        surface.blit(cached[1], cached[2])
+
+    def _build_layer(self, selected, display_size):
+        display_width, display_height = display_size
+        glow_size = max(2, int(3 * (display_width / 1920))) if selected else 0
+        bounds = self.rect.inflate(glow_size * 4, glow_size * 4).union(
+            self.rect.move(self.shadow_offset, self.shadow_offset))
+        layer = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        rect = self.rect.move(-bounds.x, -bounds.y)
+
         # Add shadow behind the button - scaled with display size
-        shadow_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        shadow_color = (255, 255, 255, 90) if self.selected else (0, 0, 0, 90)
-        shadow_surface.fill(shadow_color)
-        surface.blit(shadow_surface, (self.rect.x + self.shadow_offset, self.rect.y + self.shadow_offset))
+        shadow_color = (255, 255, 255, 90) if selected else (0, 0, 0, 90)
+        layer.fill(shadow_color, rect.move(self.shadow_offset, self.shadow_offset))
         
         # Button background - use custom color if provided, otherwise use default
         if self.bg_color:
             # For custom colored buttons, lighten the color when hovered
-            if self.selected:
+            if selected:
                 # Lighten the custom color by blending with white
                 r = min(self.bg_color[0] + 40, 255)
                 g = min(self.bg_color[1] + 40, 255)
@@ -217,47 +229,54 @@ class Button:
                 button_color = self.bg_color
         else:
             # Use default colors
-            button_color = self.menu.UI_CONSTANTS['BUTTON_HOVER_COLOR'] if self.selected else self.menu.UI_CONSTANTS['BUTTON_COLOR']
+            button_color = self.menu.UI_CONSTANTS['BUTTON_HOVER_COLOR'] if selected else self.menu.UI_CONSTANTS['BUTTON_COLOR']
             
-        button_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        button_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
         button_surface.fill(button_color)
-        surface.blit(button_surface, (self.rect.x, self.rect.y))
+        layer.blit(button_surface, rect)
         
         # Text with shadow effect - shadow offset scaled with display size
         text_shadow = self.font.render(self.text, True, (0, 0, 0, 180))
         text_surf = self.font.render(self.text, True, (255, 255, 255))
         
-        text_x = self.rect.x + (self.rect.width - text_surf.get_width()) // 2
-        text_y = self.rect.y + (self.rect.height - text_surf.get_height()) // 2
+        text_x = rect.x + (rect.width - text_surf.get_width()) // 2
+        text_y = rect.y + (rect.height - text_surf.get_height()) // 2
         
         # Scale text shadow offset with display size
-        text_shadow_offset = max(1, int(2 * pygame.display.get_surface().get_height() / 1080))
+        text_shadow_offset = max(1, int(2 * display_height / 1080))
         
-        surface.blit(text_shadow, (text_x + text_shadow_offset, text_y + text_shadow_offset))
-        surface.blit(text_surf, (text_x, text_y))
+        layer.blit(text_shadow, (text_x + text_shadow_offset, text_y + text_shadow_offset))
+        layer.blit(text_surf, (text_x, text_y))
         
         # Draw highlight border if selected - scale glow with display size
-        if self.selected:
+        if selected:
             glow_color = self.menu.UI_CONSTANTS['BUTTON_GLOW_COLOR']
-            display_width = pygame.display.get_surface().get_width()
-            glow_size = max(2, int(3 * (display_width / 1920)))
-
             for i in range(glow_size, 0, -1):
-                alpha = 60 - i * 10
-                glow_rect = self.rect.inflate(i * 4, i * 4)
+                glow_rect = rect.inflate(i * 4, i * 4)
                 glow_surface = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
-
                 pygame.draw.rect(
                     glow_surface,
-                    (*glow_color, alpha),
+                    (*glow_color, 60 - i * 10),
                     glow_surface.get_rect(),
                     border_radius=self.border_radius
                 )
+                layer.blit(glow_surface, glow_rect)
 
-                surface.blit(glow_surface, (
-                    self.rect.x - i * 2,
-                    self.rect.y - i * 2
-                ))
+        return layer, bounds.topleft
+
+def build_layer(size, draw):
+    """Run draw on a transparent surface once and keep only the area it touched"""
+    layer = pygame.Surface(size, pygame.SRCALPHA)
+    draw(layer)
+    bounds = layer.get_bounding_rect()
+    return layer.subsurface(bounds).copy(), bounds.topleft
+
+def draw_glow(surface, rect, color, size, alpha=120, falloff=15, border_radius=6):
+    for i in range(size, 0, -1):
+        glow_rect = rect.inflate(i * 4, i * 4)
+        glow_surface = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(glow_surface, (*color, alpha - i * falloff), glow_surface.get_rect(), border_radius=border_radius)
+        surface.blit(glow_surface, glow_rect)
 
 class MenuScreen:
     def __init__(self, menu, title="Menu"):
@@ -274,6 +293,8 @@ class MenuScreen:
         self.enabled = False
         self.title = title
         self.buttons = []
+        self._title_layer = None
+        self._glow_layers = {}
         
     def enable(self):
         self.enabled = True
@@ -309,6 +330,15 @@ class MenuScreen:
         if not self.enabled:
             return
         
+        if self._title_layer is None or self._title_layer[0] != self.title:
+            self._title_layer = (self.title, *build_layer(DISPLAY_SIZE, self.draw_title))
+        surface.blit(self._title_layer[1], self._title_layer[2])
+        
+        # Draw all buttons
+        for button in self.buttons:
+            button.draw(surface)
+    
+    def draw_title(self, surface):
         # Draw title with shadow
         title_shadow = self.title_font.render(self.title, True, (0, 0, 0))
         title_text = self.title_font.render(self.title, True, (255, 255, 255))
@@ -321,10 +351,14 @@ class MenuScreen:
         
         surface.blit(title_shadow, (title_x + shadow_offset, title_y + shadow_offset))
         surface.blit(title_text, (title_x, title_y))
-        
-        # Draw all buttons
-        for button in self.buttons:
-            button.draw(surface)
+    
+    def draw_flash(self, surface, button, color=(255, 60, 60)):
+        key = (tuple(button.rect), color)
+        if key not in self._glow_layers:
+            glow_size = int(3 * (DISPLAY_SIZE[0] / 1920))
+            self._glow_layers[key] = build_layer(DISPLAY_SIZE, lambda layer: draw_glow(layer, button.rect, color, glow_size))
+        layer, pos = self._glow_layers[key]
+        surface.blit(layer, pos)
     
     def clear_buttons(self):
         self.buttons = []
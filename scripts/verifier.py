@@ -0,0 +1,114 @@
+import json
+import random
+import hashlib
+import argparse
+from multiprocessing import Pool
+from scripts.constants import VERIFY_EVERY
+from scripts.simulation import Simulation
+from scripts.telemetry import telemetry
+
+def state_digest(sim):
+    # repr() round-trips floats exactly, so any bit of drift changes the digest
+    payload = repr((sim.frame, sim.snapshot(), sim.rng.getstate()))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def map_digest(map_path):
+    with open(map_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def random_inputs(frames, seed=0):
+    rng = random.Random(seed)
+    inputs = []
+    held = [0, 0, 0]
+    for _ in range(frames):
+        # Hold each key for a while so the run actually goes somewhere
+        held = [1 - key if rng.random() < 0.08 else key for key in held]
+        inputs.append(list(held))
+    return inputs
+
+def record_trace(map_path, inputs, seed=0, every=VERIFY_EVERY):
+    sim = Simulation(map_path, seed=seed)
+    hashes = [(0, state_digest(sim))]
+    for left, right, jump in inputs:
+        sim.step({'left': bool(left), 'right': bool(right), 'jump': bool(jump)})
+        if sim.frame % every == 0 or sim.frame == len(inputs):
+            hashes.append((sim.frame, state_digest(sim)))
+
+    return {
+        'map': map_path,
+        'map_digest': map_digest(map_path),
+        'seed': seed,
+        'physics': sim.physics.name, # float physics only matches on the same tile size
+        'every': every,
+        'frames': len(inputs),
+        'hashes': hashes,
+    }
+
+def first_divergence(trace_a, trace_b):
+    """Compare two traces, returns None if they agree or a dict describing the first mismatch"""
+    for key in ('map_digest', 'seed', 'physics'):
+        if trace_a[key] != trace_b[key]:
+            return {'frame': 0, 'last_match': None, 'reason': f'{key} differs: {trace_a[key]} != {trace_b[key]}'}
+
+    hashes_b = dict(map(tuple, trace_b['hashes']))
+    last_match = None
+    for frame, digest in trace_a['hashes']:
+        if frame not in hashes_b:
+            continue
+        if hashes_b[frame] != digest:
+            # With every > 1 the divergence happened somewhere in (last_match, frame]
+            return {'frame': frame, 'last_match': last_match, 'reason': 'state hash differs'}
+        last_match = frame
+    return None
+
+def _trace_job(job):
+    try:
+        return record_trace(*job)
+    finally:
+        telemetry.sync()
+
+def verify_workers(map_path, inputs, seed=0, every=VERIFY_EVERY, workers=2):
+    jobs = [(map_path, inputs, seed, every)] * workers
+    with Pool(processes=workers) as pool:
+        traces = pool.map(_trace_job, jobs)
+
+    reference = traces[0]
+    return [first_divergence(reference, trace) for trace in traces[1:]], traces
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that simulation runs are bit-for-bit reproducible')
+    parser.add_argument('map', help='map file to simulate')
+    parser.add_argument('--inputs', help='input log ([left, right, jump] per frame, e.g. a solver output)')
+    parser.add_argument('--frames', type=int, default=3600, help='length of the random input log when --inputs is not given')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--every', type=int, default=VERIFY_EVERY, help='hash the state every N frames')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--save', help='write the reference trace to this file')
+    parser.add_argument('--against', help='compare with a trace saved on another machine')
+    args = parser.parse_args()
+
+    if args.inputs:
+        with open(args.inputs, 'r') as f:
+            data = json.load(f)
+        inputs = data['inputs'] if isinstance(data, dict) else data
+    else:
+        inputs = random_inputs(args.frames, args.seed)
+
+    divergences, traces = verify_workers(args.map, inputs, args.seed, args.every, args.workers)
+    if args.against:
+        with open(args.against, 'r') as f:
+            divergences.append(first_divergence(traces[0], json.load(f)))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(traces[0], f)
+
+    failed = [divergence for divergence in divergences if divergence]
+    for divergence in failed:
+        print(f"Diverged at frame {divergence['frame']} (last matching frame: {divergence['last_match']}): {divergence['reason']}")
+    if not failed:
+        print(f"{len(divergences) + 1} runs of {len(inputs)} frames are identical")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
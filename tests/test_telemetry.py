@@ -0,0 +1,29 @@
+import os
+import json
+import glob
+import pytest
+
+pytest.importorskip('pygame')
+
+from scripts import telemetry as telemetry_module
+from scripts.verifier import verify_workers, random_inputs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_pool_workers_write_perf_records(tmp_path, monkeypatch):
+    # Forked workers see the patched module, spawned ones re-read the environment
+    path = str(tmp_path / 'telemetry-{pid}.jsonl')
+    monkeypatch.setenv('TERBOY_TELEMETRY', path)
+    monkeypatch.setattr(telemetry_module, 'TELEMETRY_PATH', path)
+
+    # Far shorter than TELEMETRY_INTERVAL, so only the end-of-task sync can write a perf record
+    verify_workers(os.path.join(ROOT, 'data', 'maps', '0.json'), random_inputs(120), workers=2)
+
+    files = glob.glob(str(tmp_path / 'telemetry-*.jsonl'))
+    assert files
+    for file in files:
+        with open(file) as f:
+            records = [json.loads(line) for line in f]
+        perf = [record for record in records if record['kind'] == 'perf']
+        assert perf, f'{file} has no perf record'
+        assert sum(record['steps_per_s'] for record in perf) > 0